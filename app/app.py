@@ -1,12 +1,22 @@
+import os
 import flet as ft
 from typing import Callable, Dict, List, TYPE_CHECKING
 
 from .config.theme import ThemeColors
 from .config.config import AppConfig
+from .utils.activity_log import ActivityLog
+from .utils.layout import LayoutService
+from .utils.todo_store import TodoStore
 
 if TYPE_CHECKING:
     from .base import BasePage
 
+
+def format_key_event(e: ft.KeyboardEvent) -> str:
+    """将键盘事件格式化为键名，例如 "Ctrl+Shift+Z"，用于查找页面的快捷键表"""
+    modifiers = [name for name, pressed in (("Ctrl", e.ctrl), ("Alt", e.alt), ("Meta", e.meta), ("Shift", e.shift)) if pressed]
+    return "+".join([*modifiers, e.key])
+
 class NavRail:
     """导航栏类，用于构建应用程序的导航栏。"""
 
@@ -181,7 +191,16 @@ class App:
         self.content_area = None
         self.nav_rail = None
         self.pages: Dict[int, "BasePage"] = {}
+        self.current_page: "BasePage" = None
         self.main_container = None
+        # 窗口尺寸服务，页面可以订阅断点变化
+        self.layout = LayoutService(self.page)
+        self._todo_store: TodoStore = None
+        # 设置页实例，其他页面可以复用设置页的控件
+        self.settings_page = None
+        # 活动日志，记录页面切换、配置修改和待办事项操作，显示在首页
+        self.activity_log = ActivityLog(os.path.join(self.config.main_path, "app", "config", "activity.jsonl"))
+        self.config.on_change = self._log_config_change
 
         # 创建导航栏
         self.nav_rail = NavRail(
@@ -190,6 +209,13 @@ class App:
             on_change=self._handle_page_change,
         )
 
+    @property
+    def todo_store(self) -> TodoStore:
+        """各页面共用的待办事项存储，第一次使用时打开"""
+        if self._todo_store is None:
+            self._todo_store = TodoStore(os.path.join(self.config.main_path, "app", "config", "todo.db"))
+        return self._todo_store
+
     def _init_window(self):
         """初始化窗口设置"""
         # 设置窗口属性
@@ -197,6 +223,7 @@ class App:
         self.page.window.height = self.config.get("Window", "height")
         self.page.window.min_width = self.config.get("Window", "min_width")
         self.page.window.min_height = self.config.get("Window", "min_height")
+        self.layout.resize(self.page.window.width, self.page.window.height)
 
         # 隐藏标题栏
         self.page.window.title_bar_hidden = True
@@ -314,14 +341,29 @@ class App:
 
     def _handle_page_change(self, page: "BasePage" = None):
         """处理页面切换"""
-        self.current_page = page
+        previous, self.current_page = self.current_page, page
+        if previous is not None and previous is not page:
+            previous.on_hide()
         self.content_area.content = page.content
         self.page.update()
+        if previous is not page:
+            page.on_show()
+            name = next((name for name, instance in self.nav_rail.pages.items() if instance is page), page.title)
+            self.activity_log.append("navigation", f"打开页面 {name}")
+
+    def _log_config_change(self, section: str, key: str, value):
+        self.activity_log.append("config", f"修改配置 {section}.{key} = {value}")
+
+    def _handle_keyboard_event(self, e: ft.KeyboardEvent):
+        """将键盘事件分发给当前显示的页面"""
+        if self.current_page is not None:
+            self.current_page.handle_key(format_key_event(e), e)
 
     def init_page(self, page: ft.Page):
         """初始化页面"""
         self.page = page
         self.platform = self.page.platform.value
+        self.page.on_keyboard_event = self._handle_keyboard_event
 
         self._init_theme()  # 先初始化主题
 
@@ -420,7 +462,8 @@ class App:
         from app.pages.settings import SettingsPage
 
         # 注册设置页面
-        self._register_page(nav_item={"icon": ft.Icons.SETTINGS_ROUNDED, "name": "设置", "is_bottom": True}, page=SettingsPage(theme_colors=self.theme_colors, theme_mode=self.config.get("Theme", "mode"), on_theme_changed=self._update_theme, page=self.page, app=self, config_manager=self.config))
+        self.settings_page = SettingsPage(theme_colors=self.theme_colors, theme_mode=self.config.get("Theme", "mode"), on_theme_changed=self._update_theme, page=self.page, app=self, config_manager=self.config)
+        self._register_page(nav_item={"icon": ft.Icons.SETTINGS_ROUNDED, "name": "设置", "is_bottom": True}, page=self.settings_page)
 
     def register_pages(self, pages: List[Dict]):
         """
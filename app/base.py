@@ -1,13 +1,18 @@
+import time
 import flet as ft
 from abc import ABC, abstractmethod
-from typing import Callable, TYPE_CHECKING
+from typing import Any, Callable, Dict, TYPE_CHECKING, Tuple, Union
 
 from components.stacked_notifications import NotificationManager
 from .config.theme import ThemeColors
+from .utils.tasks import BackgroundTask, CancelToken, run_in_background
 
 if TYPE_CHECKING:
     from app.app import App
 
+# 快捷键处理函数，或 (处理函数, 最小触发间隔秒数)，后者用于按住不放时节流
+KeyHandler = Union[Callable[[ft.KeyboardEvent], None], Tuple[Callable[[ft.KeyboardEvent], None], float]]
+
 class BasePage(ABC):
     _notification_manager = None
     def __init__(self,
@@ -35,6 +40,13 @@ class BasePage(ABC):
         if page is not None and BasePage._notification_manager is None:
             BasePage._notification_manager = NotificationManager(page)
         
+        # 正在运行的后台任务 -> 页面隐藏时是否取消
+        self._background_tasks: Dict[BackgroundTask, bool] = {}
+
+        # 快捷键表在第一次按键时通过 keymap() 创建
+        self._keymap: Dict[str, KeyHandler] = None
+        self._key_last_time: Dict[str, float] = {}
+
         # 添加一个新的属性来缓存构建的内容
         self._built_content = None
         self.content = self.build()
@@ -95,11 +107,172 @@ class BasePage(ABC):
         """
         self.notifications.show(message, type=type, duration=duration, action=action)
 
+    def keymap(self) -> Dict[str, KeyHandler]:
+        """
+        子类重写此方法注册快捷键，只在页面显示时生效
+
+        键名由修饰键和按键组成，例如 "A"、"Arrow Up"、"Ctrl+Z"、"Shift+8"
+        """
+        return {}
+
+    def handle_key(self, key: str, e: ft.KeyboardEvent) -> bool:
+        """处理键盘事件，返回是否已处理"""
+        if self._keymap is None:
+            self._keymap = self.keymap()
+        handler = self._keymap.get(key)
+        if handler is None:
+            return False
+        if isinstance(handler, tuple):
+            handler, interval = handler
+            now = time.monotonic()
+            if now - self._key_last_time.get(key, 0) < interval:
+                return True
+            self._key_last_time[key] = now
+        handler(e)
+        return True
+
+    def on_show(self):
+        """页面显示时调用，子类可以重写此方法开始加载数据"""
+        pass
+
+    def on_hide(self):
+        """页面被切换走时调用，取消未完成的后台任务，子类重写时需要调用 super().on_hide()"""
+        for task, cancel_on_hide in list(self._background_tasks.items()):
+            if cancel_on_hide:
+                task.cancel()
+
+    def set_button_loading(self, button: ft.FloatingActionButton, is_loading: bool):
+        """
+        设置按钮的加载状态
+        
+        加载按钮动画
+        
+        要使用该方法，所有button在创建时必须设置width,否则显示不正常
+        """
+        if not hasattr(self, 'page') or not self.page or self.is_rebuilding():
+            return
+            
+        if is_loading:
+            # 创建一个环形加载动画
+            progress_ring = ft.ProgressRing(
+                width=16,
+                height=16,
+                stroke_width=2,
+                color=self.theme_colors.text_color,
+            )
+            button.content = ft.Row(
+                [
+                    progress_ring,
+                    ft.Text(
+                        button.text,
+                        color=self.theme_colors.text_color,
+                        size=14,
+                        weight=ft.FontWeight.W_500
+                    ),
+                ],
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=10,
+            )
+        else:
+            # 恢复按钮原始状态
+            button.content = None
+            button.text = button.text  # 保持原有文本
+            # 如果要恢复原来的图标，可以添加以下代码
+            # button.icon = {
+            #     self.refresh_button: ft.Icons.REFRESH,
+            #     self.continue_button: ft.Icons.PLAY_ARROW,
+            #     self.stop_button: ft.Icons.STOP,
+            # }.get(button)
+        try:
+            button.update()
+        except AssertionError:
+            # 忽略在页面重建过程中的更新错误
+            pass
+
+    def set_button_progress(self, button: ft.FloatingActionButton, progress: float):
+        """在加载状态的按钮上显示进度百分比"""
+        if isinstance(button.content, ft.Row):
+            button.content.controls[1].value = f"{progress:.0%}"
+            try:
+                button.update()
+            except AssertionError:
+                pass
+
+    def run_background(
+        self,
+        job: Callable[[CancelToken], Any],
+        *,
+        on_progress: Callable[[Any], None] = None,
+        on_done: Callable[[Any], None] = None,
+        on_error: Callable[[Exception], None] = None,
+        button: ft.FloatingActionButton = None,
+        cancel_on_hide: bool = True,
+        progress_interval: float = 0.1,
+    ) -> BackgroundTask:
+        """
+        在共享线程池中运行耗时任务，不阻塞事件处理
+
+        :param job: 任务函数，接收 CancelToken，可以用 token.wait 代替 time.sleep、用 token.report 报告进度
+        :param on_progress: 进度回调，按 progress_interval 节流；传入 button 且未指定时在按钮上显示百分比
+        :param on_done: 完成回调，任务被取消后不会调用
+        :param on_error: 出错回调，默认显示错误通知
+        :param button: 任务运行期间显示加载动画并禁用的按钮
+        :param cancel_on_hide: 页面被切换走时是否取消任务
+        """
+        if button is not None:
+            self.set_button_loading(button, True)
+            button.disabled = True
+            if on_progress is None:
+                on_progress = lambda progress: self.set_button_progress(button, progress)
+
+        def finish():
+            self._background_tasks.pop(task, None)
+            if button is not None:
+                button.disabled = False
+                self.set_button_loading(button, False)
+
+        if on_error is None:
+            on_error = lambda e: self.show_notification(f"任务执行失败: {str(e)}", type="error")
+
+        task = run_in_background(
+            job,
+            on_done=on_done,
+            on_error=on_error,
+            on_progress=on_progress,
+            progress_interval=progress_interval,
+        )
+        self._background_tasks[task] = cancel_on_hide
+        task.future.add_done_callback(lambda _: finish())
+        return task
+
+    def simulate_loading(self, token: CancelToken):
+        """模拟一个耗时 10 秒的任务，等待期间可以被取消"""
+        for step in range(100):
+            if token.wait(0.1):
+                return
+            token.report((step + 1) / 100)
+
+    def start_loading(self, button: ft.FloatingActionButton, cancel_on_hide: bool = True):
+        """
+        在后台运行示例任务，按钮在任务期间禁用并显示加载动画和进度
+
+        cancel_on_hide 为 True 时切换到其他页面会取消任务
+        """
+        self.show_snackbar("按钮将被禁用，并且动画将持续10秒")
+        self.run_background(
+            self.simulate_loading,
+            button=button,
+            cancel_on_hide=cancel_on_hide,
+            on_done=lambda _: self.show_snackbar(f"{button.text}完成"),
+        )
+
     def save_state(self):
         """保存页面状态，子类可以重写此方法来保存额外的状态"""
         state = {}
-        # 只保存控件的值，让样式跟随主题
+        # 只保存控件的值，让样式跟随主题；下划线开头的私有控件由页面自己重建
         for control_name, control in vars(self).items():
+            if control_name.startswith("_"):
+                continue
             if isinstance(control, (ft.TextField, ft.Dropdown, ft.RadioGroup, ft.Text)):
                 state[control_name] = control.value
             elif isinstance(control, ft.ListView):
@@ -244,13 +417,11 @@ class BasePage(ABC):
             {"http": proxy_url, "https": proxy_url}
             {"http": None, "https": None}
         """
-        if hasattr(self, "config_manager"):
+        if not hasattr(self, "config_manager"):
             return {"http": None, "https": None}
         
-        enabled_str = self.config_manager.get("Proxy", "enabled", False)
+        enabled = self.config_manager.get("Proxy", "enabled", False)
         proxy_url = self.config_manager.get("Proxy", "url", None)
-
-        enabled = enabled_str.lower() == "true"
         
         if enabled and proxy_url:
             self.proxies = {"http": proxy_url, "https": proxy_url}
@@ -0,0 +1,137 @@
+"""
+配置加载耗时基准
+
+比较启动时读取 config.json 的几种方式，输出每种方式的中位数耗时（微秒）：
+
+- json：读取文件、json.loads、迁移、model_validate（AppConfig.load_config 的做法）
+- validate_json：读取文件后由 pydantic-core 直接解析和校验 JSON
+- marshal+validate：文件哈希未变化时从 marshal 缓存读取数据，再 model_validate
+- marshal+construct：同上，但逐层 model_construct 跳过校验
+
+分别测试默认配置和包含 200 个播放列表状态的配置，warm 为同一进程内重复加载，
+cold 为新进程中第一次加载（即应用启动时的情况）。
+
+在项目根目录运行：python -m app.config.benchmark
+"""
+import hashlib
+import json
+import marshal
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+import pydantic
+from pydantic import BaseModel
+
+from app.config.config import AppSettings, migrate
+
+WARM_RUNS = 2000
+COLD_RUNS = 30
+
+
+def load_json(path: str) -> AppSettings:
+    with open(path, "rb") as f:
+        raw = f.read()
+    data, _ = migrate(json.loads(raw.decode("utf-8")))
+    return AppSettings.model_validate(data)
+
+
+def load_validate_json(path: str) -> AppSettings:
+    with open(path, "rb") as f:
+        raw = f.read()
+    return AppSettings.model_validate_json(raw)
+
+
+def _read_marshal(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        raw = f.read()
+    with open(f"{path}.cache", "rb") as f:
+        cache = marshal.loads(f.read())
+    assert cache["hash"] == hashlib.sha1(raw).hexdigest()
+    return cache["data"]
+
+
+def load_marshal_validate(path: str) -> AppSettings:
+    return AppSettings.model_validate(_read_marshal(path))
+
+
+def _construct(model: type, data: Dict[str, Any]) -> BaseModel:
+    values = {}
+    for name, field in model.model_fields.items():
+        if name not in data:
+            continue
+        value = data[name]
+        if isinstance(field.annotation, type) and issubclass(field.annotation, BaseModel):
+            value = _construct(field.annotation, value)
+        values[name] = value
+    return model.model_construct(**values)
+
+
+def load_marshal_construct(path: str) -> AppSettings:
+    return _construct(AppSettings, _read_marshal(path))
+
+
+LOADERS: Dict[str, Callable[[str], AppSettings]] = {
+    "json": load_json,
+    "validate_json": load_validate_json,
+    "marshal+validate": load_marshal_validate,
+    "marshal+construct": load_marshal_construct,
+}
+
+
+def write_config(directory: str, name: str, playlists: int) -> str:
+    """写入配置文件及其 marshal 缓存，返回配置文件路径"""
+    data = AppSettings().model_dump()
+    data["Music"]["playlist_states"].update(
+        {f"播放列表{i}": {"last_song_path": f"assets/musics/歌曲{i}.mp3", "last_position": i} for i in range(playlists)}
+    )
+    path = os.path.join(directory, name)
+    raw = json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(raw)
+    with open(f"{path}.cache", "wb") as f:
+        marshal.dump({"hash": hashlib.sha1(raw).hexdigest(), "data": data}, f)
+    return path
+
+
+def warm(loader: Callable[[str], AppSettings], path: str) -> float:
+    timings = []
+    for _ in range(WARM_RUNS):
+        start = time.perf_counter()
+        loader(path)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def cold(loader_name: str, path: str) -> float:
+    """在新进程中导入配置模块后第一次加载的耗时"""
+    code = (
+        "import time; from app.config.benchmark import LOADERS; "
+        f"loader = LOADERS[{loader_name!r}]; start = time.perf_counter(); loader({path!r}); "
+        "print((time.perf_counter() - start) * 1e6)"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    timings = [
+        float(subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout)
+        for _ in range(COLD_RUNS)
+    ]
+    return statistics.median(timings)
+
+
+def main():
+    print(f"Python {sys.version.split()[0]}, pydantic {pydantic.VERSION}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, playlists in (("default.json", 0), ("playlists.json", 200)):
+            path = write_config(directory, name, playlists)
+            print(f"\n{name} ({os.path.getsize(path) / 1024:.1f} KB)")
+            print(f"  {'':18} {'warm (us)':>10} {'cold (us)':>10}")
+            for loader_name, loader in LOADERS.items():
+                print(f"  {loader_name:18} {warm(loader, path):10.0f} {cold(loader_name, path):10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,39 @@
+import copy
 import json
 import os
 import threading
-from typing import List, Any, Optional
-from pydantic import BaseModel, Field
+import time
+from typing import Callable, Dict, List, Any, Literal, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
-class ThemeConfig(BaseModel):
-    mode: str = "dark"
+from app.utils.file_lock import FileLock
+
+# 配置文件结构的版本号，结构变化时加 1 并在 MIGRATIONS 中添加迁移函数
+CONFIG_VERSION = 2
+
+
+class ConfigSection(BaseModel):
+    # 修改字段时同样进行类型校验，例如 "1300" 会被转换为 1300，"abc" 会抛出 ValidationError
+    model_config = ConfigDict(validate_assignment=True)
+
+class ThemeConfig(ConfigSection):
+    mode: Literal["light", "dark", "system"] = "dark"
     color: str = "ft.Colors.BLUE"
     background_image: str = "images/backgrounds/background1.jpg"
 
-class FontConfig(BaseModel):
+class FontConfig(ConfigSection):
     windows: List[str] = ["Segoe UI", "Microsoft YaHei UI", "Arial"]
     macos: List[str] = ["SF Pro", "Helvetica Neue", "PingFang SC", "Hiragino Sans GB"]
     linux: List[str] = ["Ubuntu", "Noto Sans CJK SC", "DejaVu Sans"]
 
-class WindowConfig(BaseModel):
-    width: int = 1300
-    height: int = 800
-    min_width: int = 500
-    min_height: int = 400
+class WindowConfig(ConfigSection):
+    width: int = Field(1300, gt=0)
+    height: int = Field(800, gt=0)
+    min_width: int = Field(500, gt=0)
+    min_height: int = Field(400, gt=0)
     font: FontConfig = Field(default_factory=FontConfig)
 
-class MusicConfig(BaseModel):
+class MusicConfig(ConfigSection):
     # 基础配置
     music_dir: str = "assets/musics"
     default_cover: str = "images/default_cover.jpg"
@@ -37,7 +49,7 @@ class MusicConfig(BaseModel):
     single_repeat_mode: bool = False   # 单曲循环
     
     # 播放器设置
-    volume: float = 0.75              # 音量
+    volume: float = Field(0.75, ge=0, le=1)  # 音量
     
     # 每个播放列表的最后播放歌曲路径
     playlist_states: dict = Field(default_factory=lambda: {
@@ -47,12 +59,101 @@ class MusicConfig(BaseModel):
         }
     })
 
-class AppSettings(BaseModel):
+class ProxyConfig(ConfigSection):
+    enabled: bool = False
+    url: str = ""
+
+class AppSettings(ConfigSection):
+    version: int = CONFIG_VERSION
     Theme: ThemeConfig = Field(default_factory=ThemeConfig)
     Window: WindowConfig = Field(default_factory=WindowConfig)
     Music: MusicConfig = Field(default_factory=MusicConfig)
-    
+    Proxy: ProxyConfig = Field(default_factory=ProxyConfig)
+
+
+def _migrate_v1(data: dict) -> dict:
+    """v1 -> v2：旧版设置页把窗口尺寸和代理开关保存成了字符串"""
+    window = data.get("Window")
+    if isinstance(window, dict):
+        for key in ("width", "height", "min_width", "min_height"):
+            value = window.get(key)
+            if isinstance(value, str) and value.strip().isdigit():
+                window[key] = int(value)
+    proxy = data.get("Proxy")
+    if isinstance(proxy, dict) and isinstance(proxy.get("enabled"), str):
+        proxy["enabled"] = proxy["enabled"].strip().lower() == "true"
+    return data
+
+
+# 旧版本号 -> 迁移到下一个版本的函数，没有 version 字段或版本号无效的配置文件视为版本 1
+MIGRATIONS: Dict[int, Callable[[dict], dict]] = {
+    1: _migrate_v1,
+}
+
+
+def migrate(data: dict) -> Tuple[dict, bool]:
+    """依次执行迁移函数直到当前版本，返回 (迁移后的数据, 是否发生了迁移)"""
+    version = data.get("version", 1)
+    if not isinstance(version, int) or isinstance(version, bool) or version < 1:
+        # 手动编辑出错的版本号按最早的版本处理，迁移函数只转换能识别的值
+        version = 1
+    migrated = False
+    while version < CONFIG_VERSION:
+        data = MIGRATIONS[version](data)
+        version += 1
+        data["version"] = version
+        migrated = True
+    return data, migrated
+
+
+def _drop_invalid_fields(data: dict, error: ValidationError) -> bool:
+    """删除校验失败的字段，让其恢复默认值，返回是否删除了字段"""
+    dropped = False
+    for item in error.errors():
+        node, loc = data, item["loc"]
+        # 沿着路径找到最深的一层字典，删除其中出错的键
+        for key in loc[:-1]:
+            if not isinstance(node.get(key), dict):
+                break
+            node = node[key]
+        else:
+            key = loc[-1] if loc else None
+        if isinstance(node, dict) and key in node:
+            del node[key]
+            dropped = True
+    return dropped
+
+
+def _flatten(model: BaseModel, prefix: str = "") -> Tuple[Dict[str, Any], Dict[str, BaseModel]]:
+    """把嵌套的配置模型展开为 {"Window.width": 1300, ...}，同时返回 {"Window": WindowConfig, ...}"""
+    values: Dict[str, Any] = {}
+    models: Dict[str, BaseModel] = {prefix.rstrip("."): model}
+    for name in type(model).model_fields:
+        value = getattr(model, name)
+        key = f"{prefix}{name}"
+        values[key] = value
+        if isinstance(value, BaseModel):
+            sub_values, sub_models = _flatten(value, f"{key}.")
+            values.update(sub_values)
+            models.update(sub_models)
+    return values, models
+
+
 class AppConfig:
+    """
+    配置管理器（单例）
+
+    配置保存在 app/config/config.json，读取时经过版本迁移和 pydantic 校验。
+    所有字段展开为 "节.键" 形式的字典缓存，config["Window.width"] 和 get("Window", "width")
+    都是一次字典查找；set 时先由 pydantic 校验和转换类型，再更新缓存并保存。
+    配置文件损坏时先备份原文件，再使用默认值（或删除出错字段后的配置）重新生成。
+
+    同时运行多个应用实例时，读写配置文件前先获取 config.json.lock 文件锁；
+    保存时重新读取文件，只写入本实例修改过的键，其他键采用文件中的值（即其他实例的修改）。
+
+    读取时没有缓存校验结果：解析和校验一个配置文件只需要几十到几百微秒，
+    marshal 缓存和 model_construct 都没有稳定的收益，见 app/config/benchmark.py
+    """
     # 类属性
     _instance: Optional['AppConfig'] = None
     _lock = threading.Lock()
@@ -61,6 +162,7 @@ class AppConfig:
     Theme: ThemeConfig
     Window: WindowConfig
     Music: MusicConfig
+    Proxy: ProxyConfig
     main_path: str
     config_file: str
     _initialized: bool
@@ -80,12 +182,15 @@ class AppConfig:
             self._initialized = True
             self.main_path = main_path
             self.config_file = os.path.join(main_path, "app/config/config.json")
-            self._ensure_config_file()
-            self._settings = self.load_config()
-            # 设置属性以获得IDE提示
-            self.Theme = self._settings.Theme
-            self.Window = self._settings.Window
-            self.Music = self._settings.Music
+            self._file_lock = FileLock(f"{self.config_file}.lock")
+            with self._file_lock:
+                self._ensure_config_file()
+                self._settings = self.load_config()
+            self._build_cache()
+            # 上一次与配置文件同步时的值，保存时据此判断本实例修改了哪些键
+            self._synced = self._snapshot()
+            # 配置修改后的回调 on_change(节, 键, 值)，例如记录到活动日志
+            self.on_change: Optional[Callable[[str, str, Any], None]] = None
             print("加载配置管理器成功")
         
     def _ensure_config_file(self) -> None:
@@ -96,49 +201,151 @@ class AppConfig:
 
     def _create_default_config(self) -> None:
         """创建默认配置"""
-        settings = AppSettings()
-        with open(self.config_file, 'w', encoding='utf-8') as f:
+        self._write(AppSettings())
+
+    def _write(self, settings: AppSettings) -> None:
+        # 先写临时文件再替换，写入中断时不会留下半个配置文件
+        tmp_path = f"{self.config_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(settings.model_dump(), f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.config_file)
+
+    def _backup_config_file(self) -> str:
+        """备份无法正常读取的配置文件，返回备份路径"""
+        backup_path = f"{self.config_file}.{time.strftime('%Y%m%d-%H%M%S')}.bak"
+        index = 1
+        while os.path.exists(backup_path):
+            backup_path = f"{self.config_file}.{time.strftime('%Y%m%d-%H%M%S')}-{index}.bak"
+            index += 1
+        os.replace(self.config_file, backup_path)
+        return backup_path
 
     def load_config(self) -> AppSettings:
-        """加载配置"""
+        """加载配置，依次执行版本迁移和校验，文件损坏时备份后恢复"""
         try:
             with open(self.config_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                return AppSettings.model_validate(data)
-        except (FileNotFoundError, json.JSONDecodeError):
+        except FileNotFoundError:
             return AppSettings()
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            backup_path = self._backup_config_file()
+            print(f"配置文件损坏，已备份到 {backup_path} 并使用默认配置: {str(e)}")
+            settings = AppSettings()
+            self._write(settings)
+            return settings
+        if not isinstance(data, dict):
+            data = {}
+
+        data, migrated = migrate(data)
+        try:
+            settings = AppSettings.model_validate(data)
+        except ValidationError as e:
+            # 只丢弃出错的字段，其他配置保持不变
+            while True:
+                if not _drop_invalid_fields(data, e):
+                    data = {}
+                try:
+                    settings = AppSettings.model_validate(data)
+                    break
+                except ValidationError as retry_error:
+                    e = retry_error
+            backup_path = self._backup_config_file()
+            print(f"配置文件中的部分字段无效，已备份到 {backup_path} 并恢复为默认值: {str(e)}")
+            migrated = True
+        if migrated:
+            self._write(settings)
+        return settings
+
+    def _build_cache(self) -> None:
+        """重建 "节.键" 的展开缓存，并同步各节的实例属性"""
+        self._flat, self._models = _flatten(self._settings)
+        self.Theme = self._settings.Theme
+        self.Window = self._settings.Window
+        self.Music = self._settings.Music
+        self.Proxy = self._settings.Proxy
+
+    def _snapshot(self) -> Dict[str, Any]:
+        return {key: copy.deepcopy(value) for key, value in self._flat.items() if not isinstance(value, BaseModel)}
+
+    def _read_disk(self) -> Optional[AppSettings]:
+        """读取配置文件的当前内容，无法读取时返回 None"""
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                data, _ = migrate(json.load(f))
+            return AppSettings.model_validate(data)
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _save(self) -> None:
+        """在文件锁内合并其他实例的修改后写入文件"""
+        with self._file_lock:
+            changed = {key for key, value in self._snapshot().items() if self._synced.get(key) != value}
+            disk = self._read_disk()
+            if disk is not None:
+                disk_values, _ = _flatten(disk)
+                for key, value in disk_values.items():
+                    # 本实例修改过的键以本实例为准，其余键采用文件中的值
+                    if key in changed or key not in self._flat or isinstance(value, BaseModel):
+                        continue
+                    if self._flat[key] != value:
+                        path, _, name = key.rpartition(".")
+                        setattr(self._models[path], name, value)
+                        self._flat[key] = getattr(self._models[path], name)
+            self._write(self._settings)
+            self._synced = self._snapshot()
 
     def save_config(self) -> None:
-        """保存配置"""
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(self._settings.model_dump(), f, indent=4, ensure_ascii=False)
+        """保存配置，直接修改过 config.Music 等模型的属性后也需要调用此方法"""
+        self._build_cache()
+        self._save()
+
+    def __getitem__(self, key: str) -> Any:
+        """按 "节.键" 读取配置，例如 config["Window.width"]，不存在时抛出 KeyError"""
+        return self._flat[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._flat
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """
+        按 "节.键" 修改配置并保存
+
+        值由 pydantic 校验并转换类型，无效时抛出 ValidationError（ValueError 的子类）；
+        键不存在时抛出 KeyError
+        """
+        path, _, name = key.rpartition(".")
+        model = self._models.get(path)
+        if model is None or name not in type(model).model_fields:
+            raise KeyError(key)
+        setattr(model, name, value)
+        value = getattr(model, name)
+        if isinstance(value, BaseModel):
+            # 替换了整个子模型，需要重新展开
+            self._build_cache()
+        else:
+            self._flat[key] = value
+        self._save()
+        if self.on_change:
+            section, _, field = key.partition(".")
+            self.on_change(section, field, value)
 
     def get(self, section: str, key: str, default: Any = None) -> Any:
         """获取配置值"""
-        section_data = getattr(self._settings, section, {})
-        if isinstance(section_data, BaseModel):
-            return getattr(section_data, key, default)
-        return default
+        return self._flat.get(f"{section}.{key}", default)
 
     def set(self, section: str, key: str, value: Any) -> None:
-        """设置配置值并保存"""
-        if hasattr(self._settings, section):
-            section_model = getattr(self._settings, section)
-            if hasattr(section_model, key):
-                setattr(section_model, key, value)
-                # 同步更新实例属性
-                setattr(self, section, section_model)
-                self.save_config()
-            else:
-                raise AttributeError(f"'{section}' has no attribute '{key}'")
-        else:
-            raise AttributeError(f"Settings has no section '{section}'")
+        """设置配置值并保存，值无效时抛出 ValidationError"""
+        try:
+            self[f"{section}.{key}"] = value
+        except KeyError:
+            if section not in self._models:
+                raise AttributeError(f"Settings has no section '{section}'")
+            raise AttributeError(f"'{section}' has no attribute '{key}'")
 
     def config_sections(self) -> List[str]:
         """获取所有配置节名称"""
-        return list(self._settings.model_dump().keys())
+        return [name for name, value in self._settings if isinstance(value, BaseModel)]
 
     def get_font_family(self, platform: str, index: int = 0) -> str:
         """获取指定平台的字体"""
-        return self.Window.font.__getattribute__(platform.lower())[index]
\ No newline at end of file
+        return self._flat[f"Window.font.{platform.lower()}"][index]
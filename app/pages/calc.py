@@ -1,6 +1,9 @@
+import os
 import flet as ft
 
 from app.base import BasePage
+from app.utils.calc_engine import CalculatorEngine
+from app.utils.calc_history import CalcHistoryStore, HistoryEntry
 
 
 class CalcButton(ft.ElevatedButton):
@@ -34,13 +37,15 @@ class ExtraActionButton(CalcButton):
 
 
 class CalculatorApp(ft.Container):
-    def __init__(self):
+    def __init__(self, history_store: CalcHistoryStore = None):
         super().__init__()
 
         # 用于显示完整计算过程和结果
         self.formula = ft.Text(value="", color=ft.Colors.WHITE, size=16)  # 公式显示
         self.result = ft.Text(value="0", color=ft.Colors.WHITE, size=24)  # 结果显示
-        
+
+        # 计算逻辑由引擎负责，控件只负责显示
+        self.engine = CalculatorEngine(history=history_store)
         self.reset()
 
         self.width = 500
@@ -49,7 +54,19 @@ class CalculatorApp(ft.Container):
         self.padding = 20
         self.content = ft.Column(
             controls=[
-                ft.Row(controls=[self.formula], alignment="end"),  # 显示公式
+                ft.Row(
+                    controls=[
+                        ft.IconButton(
+                            icon=ft.Icons.UNDO,
+                            icon_color=ft.Colors.WHITE,
+                            tooltip="撤销",
+                            data="undo",
+                            on_click=self.button_clicked,
+                        ),
+                        ft.Container(expand=True),
+                        self.formula,
+                    ],
+                ),  # 显示公式
                 ft.Row(controls=[self.result], alignment="end"),  # 显示结果
                 ft.Row(
                     controls=[
@@ -103,103 +120,136 @@ class CalculatorApp(ft.Container):
         )
 
     def button_clicked(self, e):
-        data = e.control.data
-        print(f"Button clicked with data = {data}")
-
-        if data == "AC":
-            self.reset()
-
-        elif data in ("1", "2", "3", "4", "5", "6", "7", "8", "9", "0", "."):
-            if self.is_new_calculation:
-                self.calculation_history = ""
-                self.formula.value = ""
-                self.is_new_calculation = False
-            if self.result.value == "0" or self.new_operand:
-                self.result.value = data
-                self.new_operand = False
-            else:
-                self.result.value += data
-            self.calculation_history += data  # 更新计算历史
-
-        elif data in ("+", "-", "*", "/"):
-            if not self.new_operand:  # 如果不是新操作，先计算当前结果
-                self.result.value = self.calculate(
-                    self.operand1, float(self.result.value), self.operator
-                )
-                self.operand1 = float(self.result.value)
-            else:
-                self.operand1 = float(self.result.value)
-            self.operator = data
-            self.calculation_history += f" {data} "  # 更新计算历史
-            self.new_operand = True
-
-        elif data == "=":
-            result = self.calculate(
-                self.operand1, float(self.result.value), self.operator
-            )
-            # 显示完整计算过程
-            self.formula.value = f"{self.calculation_history} = {result}"
-            # 只显示最终结果
-            self.result.value = str(result)
-            # 重置计算状态
-            self.operand1 = 0
-            self.operator = "+"
-            self.new_operand = True
-            # 保留完整计算过程
-            self.calculation_history = f"{self.calculation_history} = {result}"
-            # 标记需要开始新计算
-            self.is_new_calculation = True
-
-        elif data == "%":
-            self.result.value = str(float(self.result.value) / 100)
-            self.calculation_history += " %"
-            self.new_operand = True
-
-        elif data == "+/-":
-            if self.result.value.startswith("-"):
-                self.result.value = self.result.value[1:]
-            else:
-                self.result.value = "-" + self.result.value
-            self.calculation_history += " +/-"
-
-        # 更新公式显示
-        self.formula.value = self.calculation_history
+        self.press(e.control.data)
+
+    def press(self, key: str):
+        """按键输入，按钮和键盘快捷键共用"""
+        if key == "undo":
+            self.engine.undo()
+        else:
+            self.engine.press(key)
+        self.refresh()
+
+    def paste(self, text: str):
+        """计算粘贴的表达式"""
+        if text:
+            self.engine.load(text)
+            self.refresh()
+
+    def refresh(self):
+        """根据计算引擎的状态更新显示"""
+        self.formula.value = self.engine.formula
+        self.result.value = self.engine.display
         self.update()
 
     def reset(self):
-        self.operator = "+"
-        self.operand1 = 0
-        self.new_operand = True
-        self.calculation_history = ""
-        self.result.value = "0"
-        self.formula.value = ""
-        self.is_new_calculation = True
-
-    def format_number(self, num):
-        if num % 1 == 0:
-            return int(num)
-        return num
-
-    def calculate(self, operand1, operand2, operator):
+        self.engine.clear()
+        self.result.value = self.engine.display
+        self.formula.value = self.engine.formula
+
+    def rerun(self, entry: HistoryEntry):
+        """重新计算历史记录中的表达式"""
+        self.engine.load(entry.expression)
+        self.refresh()
+
+    def recall(self, entry: HistoryEntry):
+        """将历史记录的结果作为当前输入"""
+        self.engine.recall(entry.result)
+        self.refresh()
+
+
+class HistoryPanel(ft.Container):
+    """计算历史面板，滚动到底部时再加载更早的记录"""
+
+    PAGE_SIZE = 50
+
+    def __init__(self, store: CalcHistoryStore, on_rerun, on_recall):
+        super().__init__()
+        self.store = store
+        self.on_rerun = on_rerun
+        self.on_recall = on_recall
+        self._loaded = 0
+        self.list_view = ft.ListView(expand=True, spacing=0, on_scroll=self.history_scrolled)
+
+        self.width = 280
+        self.height = 500
+        self.bgcolor = ft.Colors.BLACK
+        self.border_radius = ft.border_radius.all(20)
+        self.padding = 10
+        self.content = ft.Column(
+            controls=[
+                ft.Text("历史记录", color=ft.Colors.WHITE, size=16),
+                self.list_view,
+            ],
+        )
+        self.load_more()
+        store.on_append = self.prepend
+
+    def _build_item(self, entry: HistoryEntry) -> ft.ListTile:
+        return ft.ListTile(
+            title=ft.Text(entry.expression, color=ft.Colors.WHITE54, size=12, max_lines=1, overflow=ft.TextOverflow.ELLIPSIS),
+            subtitle=ft.Text(f"= {entry.result}", color=ft.Colors.WHITE, size=16),
+            trailing=ft.IconButton(
+                icon=ft.Icons.INPUT,
+                icon_color=ft.Colors.WHITE54,
+                tooltip="使用结果",
+                on_click=lambda e: self.on_recall(entry),
+            ),
+            tooltip="重新计算",
+            on_click=lambda e: self.on_rerun(entry),
+        )
+
+    def load_more(self) -> bool:
+        """加载下一页更早的记录，返回是否加载了新记录"""
+        entries = self.store.page(offset=self._loaded, limit=self.PAGE_SIZE)
+        self._loaded += len(entries)
+        self.list_view.controls.extend(self._build_item(entry) for entry in entries)
+        return bool(entries)
+
+    def history_scrolled(self, e: ft.OnScrollEvent):
+        if e.pixels >= e.max_scroll_extent - 100 and self.load_more():
+            self.update()
+
+    def prepend(self, entry: HistoryEntry):
+        """新记录插入到最前面"""
+        self.list_view.controls.insert(0, self._build_item(entry))
+        self._loaded += 1
         try:
-            if operator == "+":
-                return self.format_number(operand1 + operand2)
-            elif operator == "-":
-                return self.format_number(operand1 - operand2)
-            elif operator == "*":
-                return self.format_number(operand1 * operand2)
-            elif operator == "/":
-                if operand2 == 0:
-                    return "Error"
-                return self.format_number(operand1 / operand2)
-        except Exception as e:
-            print(f"Error during calculation: {e}")
-            return "Error"
+            self.update()
+        except AssertionError:
+            # 面板尚未挂载到页面上
+            pass
 
 
 class CalcPage(BasePage):
-    def __init__(self, **kwargs):
-        super().__init__(title="计算器", **kwargs)
+    def __init__(self, app, **kwargs):
+        # 计算历史保存在配置目录下，主题重建时复用
+        self.history_store = CalcHistoryStore(os.path.join(app.config.main_path, "app", "config", "calc_history.jsonl"))
+        super().__init__(title="计算器", app=app, **kwargs)
     
     def build_content(self):
-        return ft.Row(controls=[CalculatorApp()], alignment=ft.MainAxisAlignment.CENTER)
+        self.calculator = CalculatorApp(self.history_store)
+        history_panel = HistoryPanel(self.history_store, on_rerun=self.calculator.rerun, on_recall=self.calculator.recall)
+        return ft.Row(controls=[self.calculator, history_panel], alignment=ft.MainAxisAlignment.CENTER)
+
+    def keymap(self):
+        # 处理函数通过 self.calculator 取当前的计算器，主题重建后依然有效
+        def press(key):
+            return lambda e: self.calculator.press(key)
+
+        keys = {
+            "Enter": "=", "Numpad Enter": "=", "=": "=",
+            "Escape": "AC", "Delete": "AC",
+            "Backspace": "undo", "Ctrl+Z": "undo", "Meta+Z": "undo",
+            "+": "+", "Shift+=": "+", "Numpad Add": "+",
+            "-": "-", "Numpad Subtract": "-",
+            "*": "*", "Shift+8": "*", "Numpad Multiply": "*",
+            "/": "/", "Numpad Divide": "/",
+            ".": ".", "Numpad Decimal": ".",
+            "%": "%", "Shift+5": "%",
+        }
+        for digit in "0123456789":
+            keys[digit] = keys[f"Numpad {digit}"] = digit
+        keymap = {key: press(value) for key, value in keys.items()}
+        keymap["Ctrl+V"] = keymap["Meta+V"] = lambda e: self.calculator.paste(self.page.get_clipboard())
+        return keymap
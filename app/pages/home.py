@@ -1,63 +1,98 @@
+import os
+import time
 import flet as ft
 from components.fletcarousel.horizontal import BasicHorizontalCarousel
 from components.fletcarousel.attributes import AutoCycle
 from app.base import BasePage
-import asyncio
-import time
+from app.pages.todo import TodoStatCards
+from app.utils.activity_log import ActivityEntry
+from app.utils.images import ThumbnailCache
+
+# 轮播图中图片的显示宽度，缩略图按两倍宽度生成以适配高分屏
+CAROUSEL_IMAGE_WIDTH = 300
+CAROUSEL_THUMBNAIL_SIZE = (CAROUSEL_IMAGE_WIDTH * 2, CAROUSEL_IMAGE_WIDTH * 2)
+# 轮播图缩略图缓存目录的大小上限
+CAROUSEL_CACHE_BYTES = 32 * 1024 * 1024
+SCREENSHOTS = [f"images/screenshot{i}.png" for i in range(1, 5)]
+# 活动列表每次加载的记录数
+ACTIVITY_PAGE_SIZE = 50
+ACTIVITY_ICONS = {
+    "navigation": ft.Icons.NAVIGATION,
+    "config": ft.Icons.SETTINGS,
+    "todo": ft.Icons.CHECKLIST,
+}
+
 
 class HomePage(BasePage):
-    def __init__(self, **kwargs):
+    def __init__(self, app, **kwargs):
         self.save_state_text = ft.TextField(label="保存状态测试文本框", hint_text="请在此输入，文字在切换主题时会保留")
-        super().__init__(title="", **kwargs)
+        self.carousel = None
+        # 轮播图使用缩略图，点击后的对话框使用原图；缩略图缓存在主题重建时复用
+        assets_dir = os.path.join(os.path.dirname(__file__), "..", "..", "assets")
+        self.image_cache = ThumbnailCache(
+            assets_dir,
+            cache_dir="images/variants",
+            size=CAROUSEL_THUMBNAIL_SIZE,
+            max_bytes=CAROUSEL_CACHE_BYTES,
+        )
+        self._carousel_images = {}
+        self.todo_stats = TodoStatCards()
+        self._activity_list = None
+        self._oldest_activity = None
+        app.activity_log.on_append = self._on_activity
+        # 窗口宽度跨过能多放或少放一张图片的位置时才调整轮播图
+        app.layout.subscribe(self._handle_layout_change, breakpoint=lambda width, height: self.carousel_items_count(width))
+        super().__init__(title="", app=app, **kwargs)
+
+    @staticmethod
+    def carousel_items_count(window_width: float) -> int:
+        """根据窗口的宽度计算轮播图同时显示的图片数量"""
+        return max(1, int((window_width - 400) // 300))
+
+    def _handle_layout_change(self, width: float, height: float):
+        if self.carousel is not None:
+            self.carousel.set_items_count(self.carousel_items_count(width))
     
-    def set_button_loading(self, button: ft.FloatingActionButton, is_loading: bool):
-        """
-        设置按钮的加载状态
-        
-        加载按钮动画
-        
-        要使用该方法，所有button在创建时必须设置width,否则显示不正常
-        """
-        if not hasattr(self, 'page') or not self.page or self.is_rebuilding():
+    def _carousel_image(self, src: str) -> ft.Image:
+        """轮播图图片，缩略图已生成时直接使用，否则先显示原图，生成完成后再替换"""
+        image = ft.Image(
+            src=self.image_cache.get(src) or f"/{src}",
+            width=CAROUSEL_IMAGE_WIDTH,
+            fit=ft.ImageFit.CONTAIN,
+        )
+        self._carousel_images[src] = image
+        return image
+
+    def _on_thumbnail_ready(self, src: str, thumb_src: str):
+        """缩略图生成完成（后台线程），替换轮播图中的原图"""
+        image = self._carousel_images.get(src)
+        if image is None or image.src == thumb_src:
             return
-            
-        if is_loading:
-            # 创建一个环形加载动画
-            progress_ring = ft.ProgressRing(
-                width=16,
-                height=16,
-                stroke_width=2,
-                color=self.theme_colors.text_color,
-            )
-            button.content = ft.Row(
-                [
-                    progress_ring,
-                    ft.Text(
-                        button.text,
-                        color=self.theme_colors.text_color,
-                        size=14,
-                        weight=ft.FontWeight.W_500
-                    ),
-                ],
-                alignment=ft.MainAxisAlignment.CENTER,
-                spacing=10,
-            )
-        else:
-            # 恢复按钮原始状态
-            button.content = None
-            button.text = button.text  # 保持原有文本
-            # 如果要恢复原来的图标，可以添加以下代码
-            # button.icon = {
-            #     self.refresh_button: ft.Icons.REFRESH,
-            #     self.continue_button: ft.Icons.PLAY_ARROW,
-            #     self.stop_button: ft.Icons.STOP,
-            # }.get(button)
+        image.src = thumb_src
         try:
-            button.update()
+            image.update()
         except AssertionError:
-            # 忽略在页面重建过程中的更新错误
+            # 图片当前不在轮播图的显示范围内，显示时会使用缩略图
             pass
 
+    def _prefetch_carousel(self, current_items: tuple):
+        """生成当前页和下一页图片的缩略图，切换到下一页时缩略图已经准备好"""
+        start, end = current_items
+        count = end - start
+        srcs = SCREENSHOTS[start:end + count]
+        # 自动轮播到最后一页后会回到开头
+        if end + count > len(SCREENSHOTS):
+            srcs += SCREENSHOTS[:count]
+        for src in srcs:
+            self.image_cache.request(src, self._on_thumbnail_ready)
+
+    def on_show(self):
+        self.todo_stats.start()
+
+    def on_hide(self):
+        super().on_hide()
+        self.todo_stats.pause()
+
     def show_img_dialog(self, e, img_src):
         self.image_dialog.content.src = img_src
         self.page.open(self.image_dialog)
@@ -80,18 +115,14 @@ class HomePage(BasePage):
                 ft.TextButton("关闭", on_click=self.close_img_dialog),
             ],
         )
-        items_count = int((self.page.window.width - 400) // 300)
+        items_count = self.carousel_items_count(self.app.layout.width)
 
         # 轮播图项目
         carousel_items = [
             ft.Container(
-                ft.Image( 
-                    src=f"/images/screenshot{i}.png",
-                    width=300,
-                    fit=ft.ImageFit.CONTAIN,
-                ),
-                on_click=lambda e, img_num=i: self.show_img_dialog(e, f"/images/screenshot{img_num}.png"),
-            ) for i in range(1, 5)            
+                self._carousel_image(src),
+                on_click=lambda e, img_src=src: self.show_img_dialog(e, f"/{img_src}"),
+            ) for src in SCREENSHOTS
         ]
 
         # 导航按钮
@@ -106,7 +137,7 @@ class HomePage(BasePage):
             )
         ]
 
-        carousel = BasicHorizontalCarousel(
+        self.carousel = carousel = BasicHorizontalCarousel(
             page=self.page,
             items_count=items_count,
             auto_cycle=AutoCycle(duration=5),
@@ -115,84 +146,29 @@ class HomePage(BasePage):
             vertical_alignment=ft.CrossAxisAlignment.CENTER,
             items_alignment=ft.MainAxisAlignment.CENTER,
             margin=ft.margin.all(20),
+            on_change=self._prefetch_carousel,
         )
+        self._prefetch_carousel(carousel.current_items)
 
         return carousel
     
-    async def start_loading(self, e):
-        """
-        异步的方式：加载按钮动画
-        
-        所有的点击事件都需要一个默认参数，所以添加e参数
-        """
-        self.set_button_loading(self.loading_button, True)
-        self.loading_button.disabled = True
-        self.show_snackbar("按钮将被禁用，并且动画将持续10秒")
-        await asyncio.sleep(10)
-        self.set_button_loading(self.loading_button, False)
-        self.loading_button.disabled = False
-        self.page.update()
-        
-    def start_loading_thread(self):
-        """
-        子线程的方式：加载按钮动画
-        
-        所有的点击事件都需要一个默认参数，所以添加e参数
-        """
-        self.set_button_loading(self.loading_button_thread, True)
-        self.loading_button_thread.disabled = True
-        self.show_dialog("按钮将被禁用，并且动画将持续10秒", "加载中")
-        time.sleep(10)
-        self.set_button_loading(self.loading_button_thread, False)
-        self.loading_button_thread.disabled = False
-        self.page.update()
-
     def _build_stats_section(self) -> ft.Container:
         """构建统计信息部分"""
-        # 活跃项目卡片
-        projects_card = ft.Container(
-            content=ft.Column([
-                ft.Text("Statistics", color=self.theme_colors.text_color, size=20),
-                ft.Text("125", color=self.theme_colors.text_color,
-                        size=40, weight="bold"),
-                ft.Text("Active Projects",
-                        color=self.theme_colors.text_color, size=14),
-            ]),
-            bgcolor=self.theme_colors.card_color,
-            padding=20,
-            border_radius=ft.border_radius.all(10),
-            width=200,
-            height=150,
-        )
-
-        # 待办任务卡片
-        tasks_card = ft.Container(
-            content=ft.Column([
-                ft.Text("Tasks", color=self.theme_colors.text_color, size=20),
-                ft.Text("42", color=self.theme_colors.text_color,
-                        size=40, weight="bold"),
-                ft.Text("Pending Tasks",
-                        color=self.theme_colors.text_color, size=14),
-            ]),
-            bgcolor=self.theme_colors.card_color,
-            padding=20,
-            border_radius=ft.border_radius.all(10),
-            width=200,
-            height=150,
-        )
+        # 统计卡片绑定到待办事项数据，轮询时只更新变化的数值
+        projects_card, tasks_card = self.todo_stats.build(self.app.todo_store, self.theme_colors)
         
         self.loading_button = ft.FloatingActionButton(
                     icon=ft.Icons.REFRESH,
-                    text="点击加载-异步",
+                    text="点击加载-可取消",
                     width=150,
-                    on_click=self.start_loading,
+                    on_click=lambda _: self.start_loading(self.loading_button),
                     height=30,
                 )
         self.loading_button_thread = ft.FloatingActionButton(
                     icon=ft.Icons.REFRESH,
-                    text="点击加载-线程",
+                    text="点击加载-后台",
                     width=150,
-                    on_click=lambda _: self.page.run_thread(self.start_loading_thread),
+                    on_click=lambda _: self.start_loading(self.loading_button_thread, cancel_on_hide=False),
                     height=30,
                     bgcolor=ft.Colors.GREEN
                 )
@@ -295,24 +271,48 @@ class HomePage(BasePage):
         )
         return container
 
+    def _activity_tile(self, entry: ActivityEntry) -> ft.ListTile:
+        return ft.ListTile(
+            leading=ft.Icon(ACTIVITY_ICONS.get(entry.kind, ft.Icons.HISTORY)),
+            title=ft.Text(entry.title, color=self.theme_colors.text_color),
+            subtitle=ft.Text(time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry.timestamp)), color=self.theme_colors.text_color),
+        )
+
+    def load_more_activities(self) -> bool:
+        """从活动日志中加载更早的一页记录，返回是否加载了新记录"""
+        entries = self.app.activity_log.page(before=self._oldest_activity, limit=ACTIVITY_PAGE_SIZE)
+        if not entries:
+            return False
+        self._oldest_activity = entries[-1].seq
+        self._activity_list.controls.extend(self._activity_tile(entry) for entry in entries)
+        return True
+
+    def activities_scrolled(self, e: ft.OnScrollEvent):
+        # 滚动到接近底部时再加载更早的记录
+        if e.pixels >= e.max_scroll_extent - 100 and self.load_more_activities():
+            self._activity_list.update()
+
+    def _on_activity(self, entry: ActivityEntry):
+        """新的活动记录插入到列表顶部"""
+        if self._activity_list is None:
+            return
+        self._activity_list.controls.insert(0, self._activity_tile(entry))
+        try:
+            self._activity_list.update()
+        except AssertionError:
+            # 首页当前没有显示，切换回来时会显示最新的列表
+            pass
+
     def _build_activities_section(self) -> ft.Container:
         """构建活动列表部分"""
-        activities = [
-            ("Team Meeting", "10:00 AM", ft.Icons.CALENDAR_MONTH),
-            ("Project Review", "2:30 PM", ft.Icons.WORK),
-            ("Client Meeting", "4:00 PM", ft.Icons.PERSON),
-        ]
-
-        activity_items = [
-            ft.ListTile(
-                leading=ft.Icon(icon),
-                title=ft.Text(title, color=self.theme_colors.text_color),
-                subtitle=ft.Text(time, color=self.theme_colors.text_color),
-            ) for title, time, icon in activities
-        ]
+        # ListView 只渲染可见范围内的行，滚动到底部时再加载更早的记录；
+        # 列表是私有属性，主题重建时不会被 save_state 复制，而是从活动日志重新加载
+        self._activity_list = ft.ListView(spacing=0, height=300, on_scroll=self.activities_scrolled)
+        self._oldest_activity = None
+        self.load_more_activities()
 
         activities_list = ft.Container(
-            content=ft.Column(activity_items),
+            content=self._activity_list,
             bgcolor=self.theme_colors.card_color,
             border_radius=ft.border_radius.all(10),
             padding=10,
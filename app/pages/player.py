@@ -12,6 +12,11 @@ if TYPE_CHECKING:
 
 
 class MusicPlayer(BasePage):
+    # 方向键每次调节的音量
+    VOLUME_STEP = 0.05
+    # 按住按键时两次响应的最小间隔（秒）
+    KEY_REPEAT_INTERVAL = 0.05
+
     def __init__(self, app, **kwargs):
         self.app: "App" = app
         self.title = "音乐播放器"
@@ -96,6 +101,42 @@ class MusicPlayer(BasePage):
         self.play_button.icon = ft.Icons.PAUSE if self.is_playing else ft.Icons.PLAY_ARROW
         self.page.update()
 
+    def toggle_mute(self, e=None):
+        """切换静音，不改变保存的音量"""
+        self.mute = not self.mute
+        self.audio.volume = 0 if self.mute else self.volume_slider.value
+        self.mute_button.icon = ft.Icons.VOLUME_OFF if self.mute else ft.Icons.VOLUME_UP
+        self.mute_button.selected = self.mute
+        self.audio.update()
+        self.mute_button.update()
+
+    def set_volume(self, volume: float):
+        volume = min(1.0, max(0.0, round(volume, 2)))
+        self.volume_slider.value = volume
+        if self.mute:
+            # 调节音量时自动取消静音
+            self.mute = False
+            self.mute_button.icon = ft.Icons.VOLUME_UP
+            self.mute_button.selected = False
+            self.mute_button.update()
+        self.audio.volume = volume
+        self.audio.update()
+        self.volume_slider.update()
+
+    def volume_changed(self, e):
+        self.set_volume(self.volume_slider.value)
+
+    def keymap(self):
+        return {
+            "M": self.toggle_mute,
+            " ": self.toggle_play_pause,
+            # 按住方向键时键盘会连续触发事件，节流后再更新控件
+            "Arrow Up": (lambda e: self.set_volume(self.volume_slider.value + self.VOLUME_STEP), self.KEY_REPEAT_INTERVAL),
+            "Arrow Down": (lambda e: self.set_volume(self.volume_slider.value - self.VOLUME_STEP), self.KEY_REPEAT_INTERVAL),
+            "Arrow Left": (self.previous_song, self.KEY_REPEAT_INTERVAL * 5),
+            "Arrow Right": (self.next_song, self.KEY_REPEAT_INTERVAL * 5),
+        }
+
     def next_song(self, e):
         """播放下一首歌曲"""
         return
@@ -197,7 +238,7 @@ class MusicPlayer(BasePage):
                 icon=ft.Icons.PLAY_ARROW, on_click=self.toggle_play_pause, icon_size=32, icon_color=self.theme_colors.accent_color)
 
             self.mute_button = ft.IconButton(
-                icon=ft.Icons.VOLUME_OFF if self.mute else ft.Icons.VOLUME_UP, icon_size=24, tooltip="静音 快捷键:M", selected=self.mute)
+                icon=ft.Icons.VOLUME_OFF if self.mute else ft.Icons.VOLUME_UP, icon_size=24, tooltip="静音 快捷键:M", selected=self.mute, on_click=self.toggle_mute)
 
             self.volume_slider = ft.Slider(
                 min=0,
@@ -205,6 +246,7 @@ class MusicPlayer(BasePage):
                 value=self.app.config.Music.volume,  # 使用保存的音量值
                 width=150,
                 tooltip="音量 快捷键:上下",
+                on_change=self.volume_changed,
             )
 
             # 保存按钮为类属性
@@ -1,11 +1,13 @@
 import flet as ft
 import os
+import threading
 from app.base import BasePage
+from app.utils.images import DirectoryIndex, ThumbnailCache
 from app.config.version import VERSION, APP_DESCRIPTION, GITHUB_URL
 import requests
 import asyncio
 
-from typing import TYPE_CHECKING
+from typing import List, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from app.app import AppConfig
@@ -14,16 +16,23 @@ if TYPE_CHECKING:
 class SettingsPage(BasePage):
     def __init__(self, config_manager, **kwargs):
         self.config_manager: AppConfig = config_manager
+        # 背景图片目录索引和缩略图缓存，主题重建时复用
+        assets_dir = os.path.join(os.path.dirname(__file__), "..", "..", "assets")
+        self.background_index = DirectoryIndex(os.path.join(assets_dir, "images", "backgrounds"))
+        # 原图有数 MB，未安装 Pillow 时显示占位图标而不是加载原图
+        self.thumbnail_cache = ThumbnailCache(assets_dir, source_fallback=False)
+        self.background_dropdown = None
+        self._background_icons = {}
+        self._thumbnail_refresh_timer = None
         super().__init__(title="设置", **kwargs)
         self.proxy_test_text = None
         self.proxy_url = None
         self.proxy_controls = None
         self.proxy_switch = None
 
-    def _build_theme_settings(self) -> ft.Container:
-        """构建主题设置部分"""
-        # 主题模式和主题色选择
-        theme_mode_row = ft.Row([
+    def build_theme_mode_row(self) -> ft.Row:
+        """主题模式选择，设置页和 Stack 页的弹出面板共用"""
+        return ft.Row([
             ft.Text("主题模式", size=16, color=self.theme_colors.text_color),
             ft.Container(width=20),
             ft.SegmentedButton(
@@ -49,10 +58,11 @@ class SettingsPage(BasePage):
             ),
         ], alignment=ft.MainAxisAlignment.START)
 
-        # 主题色选择
+    def build_theme_color_row(self) -> ft.Row:
+        """主题色选择，设置页和 Stack 页的弹出面板共用"""
         current_color = self.config_manager.get(
             "Theme", "color", ft.Colors.BLUE)
-        theme_colors_row = ft.Row([
+        return ft.Row([
             ft.Text("主题色 ", size=16, color=self.theme_colors.text_color),
             ft.Container(width=20),
             ft.Dropdown(
@@ -84,38 +94,43 @@ class SettingsPage(BasePage):
             ),
         ], alignment=ft.MainAxisAlignment.START)
 
+    def _build_theme_settings(self) -> ft.Container:
+        """构建主题设置部分"""
+        # 主题模式和主题色选择
+        theme_mode_row = self.build_theme_mode_row()
+        theme_colors_row = self.build_theme_color_row()
+
         # 背景图片选择
         current_bg = self.config_manager.get(
             "Theme", "background_image", "images/backgrounds/background1.jpg").split("/")[-1]
-        # 获取背景图片列表
-        bg_dir = os.path.join(os.path.dirname(__file__),
-                              "..", "..", "assets", "images", "backgrounds")
-        bg_files = [f for f in os.listdir(
-            bg_dir) if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
+        # 获取背景图片列表（目录未变化时直接使用缓存）
+        bg_files = self.background_index.files()
+
+        self._background_icons = {}
+        self.background_dropdown = ft.Dropdown(
+            width=200,
+            value=current_bg,
+            content_padding=ft.padding.symmetric(horizontal=10),
+            options=[
+                ft.dropdown.Option(
+                    key=bg_file,
+                    content=ft.Row([
+                        self._build_background_icon(bg_file),
+                        ft.Text(
+                            f"{bg_file.split('.')[0]}", color=self.theme_colors.text_color)
+                    ])
+                )
+                for bg_file in bg_files
+            ],
+            on_change=lambda e: self._handle_background_change(e.data),
+            select_icon=ft.Icons.CHECK,
+            # select_icon_enabled_color=self.theme_colors.text_color, # deprecated
+        )
 
         background_row = ft.Row([
             ft.Text("背景图片", size=16, color=self.theme_colors.text_color),
             ft.Container(width=20),
-            ft.Dropdown(
-                width=200,
-                value=current_bg,
-                content_padding=ft.padding.symmetric(horizontal=10),
-                options=[
-                    ft.dropdown.Option(
-                        key=bg_file,
-                        content=ft.Row([
-                            ft.Icon(ft.Icons.IMAGE,
-                                    color=self.theme_colors.text_color),
-                            ft.Text(
-                                f"{bg_file.split('.')[0]}", color=self.theme_colors.text_color)
-                        ])
-                    )
-                    for bg_file in bg_files
-                ],
-                on_change=lambda e: self._handle_background_change(e.data),
-                select_icon=ft.Icons.CHECK,
-                # select_icon_enabled_color=self.theme_colors.text_color, # deprecated
-            ),
+            self.background_dropdown,
         ], alignment=ft.MainAxisAlignment.START)
 
         return self.build_section(
@@ -129,6 +144,43 @@ class SettingsPage(BasePage):
             ], spacing=0)
         )
 
+    def _build_background_icon(self, bg_file: str) -> ft.Container:
+        """构建背景图片选项的缩略图，缩略图未生成时先显示占位图标"""
+        thumb_src = self.thumbnail_cache.request(f"images/backgrounds/{bg_file}", self._on_thumbnail_ready)
+        icon = ft.Container(
+            content=self._thumbnail_image(thumb_src) if thumb_src else ft.Icon(ft.Icons.IMAGE, color=self.theme_colors.text_color),
+            width=48,
+            height=30,
+            alignment=ft.alignment.center,
+        )
+        self._background_icons[bg_file] = icon
+        return icon
+
+    def _thumbnail_image(self, src: str) -> ft.Image:
+        return ft.Image(src=src, width=48, height=30, fit=ft.ImageFit.COVER, border_radius=4)
+
+    def _on_thumbnail_ready(self, src: str, thumb_src: str):
+        """缩略图生成完成（后台线程），替换占位图标并合并刷新"""
+        icon = self._background_icons.get(src.split("/")[-1])
+        if icon is None:
+            return
+        icon.content = self._thumbnail_image(thumb_src)
+        # 大量缩略图同时完成时只刷新一次下拉框
+        if self._thumbnail_refresh_timer is None:
+            self._thumbnail_refresh_timer = threading.Timer(0.2, self._refresh_background_dropdown)
+            self._thumbnail_refresh_timer.daemon = True
+            self._thumbnail_refresh_timer.start()
+
+    def _refresh_background_dropdown(self):
+        self._thumbnail_refresh_timer = None
+        if self.background_dropdown is None:
+            return
+        try:
+            self.background_dropdown.update()
+        except AssertionError:
+            # 下拉框尚未挂载到页面上，下次显示时会使用最新的内容
+            pass
+
     def _build_proxy_settings(self) -> ft.Container:
         """构建代理设置部分"""
         # 代理开关
@@ -143,7 +195,8 @@ class SettingsPage(BasePage):
             label="代理地址",
             value=self.config_manager.get("Proxy", "url", ""),
             hint_text="例如: http://127.0.0.1:7890",
-            on_change=lambda e: self._handle_proxy_url_change(e),
+            on_submit=lambda e: self._save_proxy_url(e),
+            on_blur=lambda e: self._save_proxy_url(e),
         )
 
         # 测试按钮和结果文本
@@ -170,16 +223,17 @@ class SettingsPage(BasePage):
             expand=True
         )
 
-    def _build_window_settings(self) -> ft.Container:
-        """构建窗口设置部分"""
-        # 默认尺寸设置
-        default_size = ft.Row([
+    def build_window_size_fields(self) -> List[ft.TextField]:
+        """窗口尺寸输入框，设置页和 Stack 页的弹出面板共用"""
+        return [
             ft.TextField(
                 label="默认宽度",
                 value=self.config_manager.get("Window", "width", 1300),
                 width=150,
                 data="width",
                 on_change=lambda e: self._handle_window_size_change(e),
+                on_submit=lambda e: self._save_window_size(e),
+                on_blur=lambda e: self._save_window_size(e),
             ),
             ft.TextField(
                 label="默认高度",
@@ -187,14 +241,17 @@ class SettingsPage(BasePage):
                 width=150,
                 data="height",
                 on_change=lambda e: self._handle_window_size_change(e),
+                on_submit=lambda e: self._save_window_size(e),
+                on_blur=lambda e: self._save_window_size(e),
             ),
-            ft.Container(width=100),
             ft.TextField(
                 label="最小宽度",
                 value=self.config_manager.get("Window", "min_width", 500),
                 width=150,
                 data="min_width",
                 on_change=lambda e: self._handle_window_size_change(e),
+                on_submit=lambda e: self._save_window_size(e),
+                on_blur=lambda e: self._save_window_size(e),
             ),
             ft.TextField(
                 label="最小高度",
@@ -202,8 +259,16 @@ class SettingsPage(BasePage):
                 width=150,
                 data="min_height",
                 on_change=lambda e: self._handle_window_size_change(e),
+                on_submit=lambda e: self._save_window_size(e),
+                on_blur=lambda e: self._save_window_size(e),
             ),
-        ], spacing=20)
+        ]
+
+    def _build_window_settings(self) -> ft.Container:
+        """构建窗口设置部分"""
+        # 默认尺寸设置
+        width, height, min_width, min_height = self.build_window_size_fields()
+        default_size = ft.Row([width, height, ft.Container(width=100), min_width, min_height], spacing=20)
 
         return self.build_section(
             "窗口设置",
@@ -304,12 +369,23 @@ class SettingsPage(BasePage):
         self.page.update()
 
     def _handle_window_size_change(self, e):
-        if self.config_manager:
-            try:
-                value = int(e.control.value)
-                self.config_manager.set("Window", e.control.data, str(value))
-            except ValueError:
-                pass
+        """输入时只检查格式，提交或失去焦点时才保存，避免每次按键都写配置和活动日志"""
+        value = e.control.value.strip()
+        error_text = None if value.isdigit() and int(value) > 0 else "请输入正整数"
+        if e.control.error_text != error_text:
+            e.control.error_text = error_text
+            e.control.update()
+
+    def _save_window_size(self, e):
+        if not self.config_manager or e.control.error_text:
+            return
+        try:
+            # 由配置模型校验并转换为整数，值没有变化时不保存
+            if int(e.control.value) != self.config_manager.get("Window", e.control.data):
+                self.config_manager.set("Window", e.control.data, e.control.value)
+        except ValueError:
+            e.control.error_text = "请输入正整数"
+            e.control.update()
 
     def _check_updates(self, e):
         """检查更新"""
@@ -317,13 +393,14 @@ class SettingsPage(BasePage):
 
     def _handle_proxy_change(self, e):
         if self.config_manager:
-            enabled = e.control.value
-            self.config_manager.set("Proxy", "enabled", str(enabled))
+            self.config_manager.set("Proxy", "enabled", e.control.value)
 
-    def _handle_proxy_url_change(self, e):
+    def _save_proxy_url(self, e):
+        """提交或失去焦点时才保存，避免每次按键都写配置和活动日志"""
         if self.config_manager:
-            proxy_url = e.control.value
-            self.config_manager.set("Proxy", "url", proxy_url)
+            proxy_url = e.control.value.strip()
+            if proxy_url != self.config_manager.get("Proxy", "url", ""):
+                self.config_manager.set("Proxy", "url", proxy_url)
 
     async def _test_proxy(self, e):
         if not self.proxy_test_text:
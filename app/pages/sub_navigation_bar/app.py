@@ -1,7 +1,8 @@
 import flet as ft
+from collections import OrderedDict
 from app.base import BasePage
 from app.app import ThemeColors
-from typing import Callable
+from typing import Callable, Dict
 from . import FloatingPage, TimePickerPage, ChartPage, ButtonsPage
 
 class SubNavRail:
@@ -23,22 +24,29 @@ class SubNavRail:
         self.on_change = on_change  # 保存回调函数
         self.first_page_added = False  # 添加标记，用于跟踪第一个页面
 
-    def add_page(self, name: str, page_class, icon, is_bottom=False):
+        # 按钮颜色只依赖主题，导航栏随主题重建，因此在这里预先计算一次
+        self.active_color = self.theme_colors.accent_color
+        self.inactive_color = ft.Colors.with_opacity(0.7, self.theme_colors.text_color)
+        self.active_bgcolor = ft.Colors.with_opacity(0.1, self.theme_colors.sub_nav_color)
+        self.hover_bgcolor = ft.Colors.with_opacity(0.05, self.theme_colors.sub_nav_color)
+
+    def add_page(self, name: str, page_class, icon, is_bottom=False, active: bool = None):
         """
         添加页面和对应的导航按钮
         :param name: 页面唯一标识
-        :param page_class: 页面类
+        :param page_class: 页面类，页面实例在第一次显示时由 on_change 的接收方创建
         :param icon: 按钮图标
         :param is_bottom: 是否固定在底部
+        :param active: 是否激活，默认激活第一个添加的页面
         """
-        # 创建页面实例 - 直接使用已经创建的实例
-        page_instance = page_class
-        self.pages[name] = page_instance
+        self.pages[name] = page_class
 
         # 如果是第一个添加的页面，则自动激活
-        active = not self.first_page_added
-        if not self.first_page_added:
-            self.first_page_added = True
+        if active is None:
+            active = not self.first_page_added
+        if active:
+            self.current_page = name
+        self.first_page_added = True
 
         # 添加对应的导航按钮
         self.add_button(name, icon, active, is_bottom)
@@ -54,26 +62,29 @@ class SubNavRail:
             print(f"页面 {name} 不存在！")
             return
 
-        for btn_name, button in self.buttons.items():
-            is_current = btn_name == name
-            # 更新图标和文本颜色
-            if isinstance(button.content, ft.Row):
-                icon = button.content.controls[0]
-                text = button.content.controls[1]
-                icon.color = self.theme_colors.accent_color if is_current else ft.Colors.with_opacity(0.7, self.theme_colors.text_color)
-                text.color = self.theme_colors.accent_color if is_current else ft.Colors.with_opacity(0.7, self.theme_colors.text_color)
-            # 更新背景色
-            button.bgcolor = ft.Colors.with_opacity(0.1, self.theme_colors.sub_nav_color) if is_current else None
-            button.update()
-            
+        # 只更新之前选中的按钮和新选中的按钮
+        previous = self.current_page
+        if previous != name:
+            if previous in self.buttons:
+                self._set_button_style(self.buttons[previous], False)
+            self._set_button_style(self.buttons[name], True)
+
         # 更新当前页面
         self.current_page = name
 
-        # 调用回调函数通知页面变更
+        # 调用回调函数通知页面变更，回调中的 page.update() 会一起发送按钮的变化
         if self.on_change:
-            self.on_change(self.pages[name])
+            self.on_change(name)
+        else:
+            self.page.update()
 
-        self.page.update()
+    def _set_button_style(self, button: ft.Container, active: bool):
+        """设置按钮的选中样式，不立即更新"""
+        color = self.active_color if active else self.inactive_color
+        icon, text = button.content.controls[0], button.content.controls[1]
+        icon.color = color
+        text.color = color
+        button.bgcolor = self.active_bgcolor if active else None
 
     def add_button(self, name, icon, active=False, is_bottom=False, on_click=None):
         """
@@ -92,11 +103,11 @@ class SubNavRail:
                     ft.Icon(
                         icon,
                         size=26,
-                        color=self.theme_colors.accent_color if active else ft.Colors.with_opacity(0.7, self.theme_colors.text_color),
+                        color=self.active_color if active else self.inactive_color,
                     ),
                     ft.Text(
                         name,
-                        color=self.theme_colors.accent_color if active else ft.Colors.with_opacity(0.7, self.theme_colors.text_color),
+                        color=self.active_color if active else self.inactive_color,
                         size=13,
                         weight=ft.FontWeight.W_500,
                     ),
@@ -106,7 +117,7 @@ class SubNavRail:
             ),
             padding=ft.padding.only(left=12, top=8, bottom=8, right=12),
             border_radius=ft.border_radius.all(6),
-            bgcolor=ft.Colors.with_opacity(0.1, self.theme_colors.sub_nav_color) if active else None,
+            bgcolor=self.active_bgcolor if active else None,
             ink=True,  # 添加水波纹效果
             on_hover=lambda e: self._handle_hover(e, name),  # 添加悬停效果
             on_click=lambda e: self._handle_click(name) if on_click is None else on_click(e),
@@ -123,8 +134,12 @@ class SubNavRail:
     def _handle_hover(self, e: ft.HoverEvent, name: str):
         """处理按钮悬停事件"""
         # 如果不是当前选中的按钮，才改变背景色
-        if name != self.current_page:
-            e.control.bgcolor = ft.Colors.with_opacity(0.05, self.theme_colors.sub_nav_color) if e.data == "true" else None
+        if name == self.current_page:
+            return
+        bgcolor = self.hover_bgcolor if e.data == "true" else None
+        # 悬停状态没有变化时不发送更新
+        if e.control.bgcolor != bgcolor:
+            e.control.bgcolor = bgcolor
             e.control.update()
 
     def _handle_click(self, name):
@@ -141,11 +156,7 @@ class SubNavRail:
             print(f"页面 {page_name} 不存在！")
             return False
 
-        # 更新按钮状态
-        for btn_name, button in self.buttons.items():
-            button.icon_color = ft.Colors.GREEN if btn_name == page_name else self.theme_colors.text_color
-            button.text_color = ft.Colors.GREEN if btn_name == page_name else self.theme_colors.text_color
-        # 显示页面
+        # 显示页面，按钮状态由 show_page 更新
         self.show_page(page_name)
         return True
 
@@ -178,13 +189,12 @@ class SubNavRail:
 class SubNavigationBar(BasePage):
     """子导航栏示例"""
 
+    # 最多保留的子页面实例数量，None 表示不限制；超出时移除最久未访问的子页面
+    MAX_CACHED_PAGES = None
+
     def __init__(self, **kwargs):
         # 设置为有子导航栏
         self.has_sub_nav = True
-        super().__init__(title="子导航栏示例", has_sub_nav=self.has_sub_nav, **kwargs)
-
-    def build_content(self) -> ft.Control:
-        """构建页面内容"""
         # 定义子页面
         self._pages = [
             {"icon": ft.Icons.RECTANGLE, "name": "按钮", "page_class": ButtonsPage},
@@ -192,18 +202,45 @@ class SubNavigationBar(BasePage):
             {"icon": ft.Icons.TEXT_FIELDS, "name": "时间选择", "page_class": TimePickerPage},
             {"icon": ft.Icons.BAR_CHART, "name": "图表", "page_class": ChartPage},
         ]
+        # 已创建的子页面实例，按访问顺序排列，主题重建时复用
+        self._page_instances: Dict[str, BasePage] = OrderedDict()
+        self.current_name = self._pages[0]["name"]
+        self.current_page = None
+        super().__init__(title="子导航栏示例", has_sub_nav=self.has_sub_nav, **kwargs)
 
-        # 初始化页面实例
-        self._page_instances = {}
-        for page_info in self._pages:
-            self._page_instances[page_info["name"]] = page_info["page_class"](
+    def get_page(self, name: str) -> BasePage:
+        """返回子页面实例，第一次访问时才创建"""
+        instance = self._page_instances.get(name)
+        if instance is None:
+            page_class = next(info["page_class"] for info in self._pages if info["name"] == name)
+            instance = page_class(
                 theme_colors=self.theme_colors,
                 theme_mode=self.theme_mode,
                 page=self.page,  # 使用从父类继承的 page 实例
+                app=self.app,
             )
+            self._page_instances[name] = instance
+            self._evict_pages()
+        else:
+            if instance.theme_colors is not self.theme_colors:
+                # 主题变化后第一次访问时再重建
+                instance.update_theme(self.theme_colors, self.theme_mode)
+            self._page_instances.move_to_end(name)
+        return instance
+
+    def _evict_pages(self):
+        if self.MAX_CACHED_PAGES is None:
+            return
+        for name in list(self._page_instances):
+            if len(self._page_instances) <= self.MAX_CACHED_PAGES:
+                break
+            if name != self.current_name:
+                del self._page_instances[name]
 
-        # 设置当前页面
-        self.current_page = list(self._page_instances.values())[0]
+    def build_content(self) -> ft.Control:
+        """构建页面内容"""
+        # 设置当前页面，重建时保留当前选中的子页面
+        self.current_page = self.get_page(self.current_name)
 
         # 创建自定义导航栏
         self.nav_rail = SubNavRail(
@@ -216,13 +253,14 @@ class SubNavigationBar(BasePage):
         for page_info in self._pages:
             self.nav_rail.add_page(
                 name=page_info["name"],
-                page_class=self._page_instances[page_info["name"]],
+                page_class=page_info["page_class"],
                 icon=page_info["icon"],
+                active=page_info["name"] == self.current_name,
             )
 
-        # 构建内容区域
+        # 构建内容区域，直接使用子页面已经构建好的内容
         self.content_area = ft.Container(
-            content=self.current_page.build_content(),
+            content=self.current_page.content,
             expand=True,
             padding=ft.padding.only(left=150),  # 为导航栏留出空间
         )
@@ -238,15 +276,29 @@ class SubNavigationBar(BasePage):
             expand=True,
         )
 
-    def _handle_nav_change(self, page_instance):
+    def _handle_nav_change(self, name: str):
         """处理子导航切换事件"""
         # 更新当前页面
-        self.current_page: BasePage = page_instance
+        previous = self.current_page
+        self.current_name = name
+        self.current_page = self.get_page(name)
+        if previous is not self.current_page:
+            # 离开的子页面取消未完成的任务
+            previous.on_hide()
 
         # 更新内容区域
         if hasattr(self, 'content_area'):
             self.content_area.content = self.current_page.content
             self.page.update()
+        if previous is not self.current_page:
+            self.current_page.on_show()
+
+    def on_show(self):
+        self.current_page.on_show()
+
+    def on_hide(self):
+        super().on_hide()
+        self.current_page.on_hide()
     
     def switch_page(self, page_name: str) -> bool:
         """
@@ -255,3 +307,9 @@ class SubNavigationBar(BasePage):
         :return: 是否切换成功
         """
         return self.nav_rail.switch_to(page_name)
+
+    def handle_key(self, key: str, e: ft.KeyboardEvent) -> bool:
+        """自身没有处理的按键交给当前子页面"""
+        if super().handle_key(key, e):
+            return True
+        return self.current_page is not None and self.current_page.handle_key(key, e)
@@ -1,61 +1,58 @@
+import math
+import random
+import threading
 import flet as ft
 from app.base import BasePage
+from app.utils.tasks import CancelToken
+from components.charts import InteractivePieChart, LineSeries, LiveChartUpdater, LiveSeries, aggregate, bar_groups, pie_sections
 
 class ChartPage(BasePage):
     """图表示例页面"""
-    
+
+    # 页面宽度未知时使用的图表宽度
+    DEFAULT_CHART_WIDTH = 800
+    # 实时图表显示的样本数和模拟数据的产生频率
+    LIVE_WINDOW = 200
+    LIVE_SAMPLE_RATE = 100
+
+    # 条形图和饼图的原始记录，同一分类可以有多条
+    FRUIT_RECORDS = [
+        {"fruit": "苹果", "amount": 25}, {"fruit": "蓝莓", "amount": 60}, {"fruit": "樱桃", "amount": 30},
+        {"fruit": "橙子", "amount": 35}, {"fruit": "苹果", "amount": 15}, {"fruit": "蓝莓", "amount": 40},
+        {"fruit": "橙子", "amount": 25},
+    ]
+    FRUIT_COLORS = {"苹果": ft.Colors.AMBER, "蓝莓": ft.Colors.BLUE, "樱桃": ft.Colors.RED, "橙子": ft.Colors.ORANGE}
+    # 分组超过该数量时，其余分组合并为"其他"
+    MAX_GROUPS = 6
+
     def __init__(self, **kwargs):
         self.toggle = False
+        self.live_updater = None
+        self._producer_stop = threading.Event()
+        # 后台准备的图表数据，主题重建时复用
+        self.chart_data = None
+        self.chart_task = None
+        # 页面显示期间订阅窗口尺寸变化，隐藏时取消订阅
+        self._unsubscribe_layout = None
         super().__init__(title="图表", **kwargs)
     
     def build_pie_chart(self):
-        pie_chart1_normal_border = ft.BorderSide(0, ft.Colors.with_opacity(0, ft.Colors.WHITE))
-        pie_chart1_hovered_border = ft.BorderSide(6, ft.Colors.WHITE)
-
-
-        def on_chart_event(e: ft.PieChartEvent):
-            for idx, section in enumerate(self.pie_chart1.sections):
-                section.border_side = (
-                    pie_chart1_hovered_border if idx == e.section_index else pie_chart1_normal_border
-                )
-            self.pie_chart1.update()
-
-        self.pie_chart1 = ft.PieChart(
+        # 饼图 1：悬停时显示边框
+        self.pie_chart1 = InteractivePieChart(
             sections=[
-                ft.PieChartSection(
-                    25,
-                    color=ft.Colors.BLUE,
-                    radius=80,
-                    border_side=pie_chart1_normal_border,
-                ),
-                ft.PieChartSection(
-                    25,
-                    color=ft.Colors.YELLOW,
-                    radius=65,
-                    border_side=pie_chart1_normal_border,
-                ),
-                ft.PieChartSection(
-                    25,
-                    color=ft.Colors.PINK,
-                    radius=60,
-                    border_side=pie_chart1_normal_border,
-                ),
-                ft.PieChartSection(
-                    25,
-                    color=ft.Colors.GREEN,
-                    radius=70,
-                    border_side=pie_chart1_normal_border,
-                ),
+                ft.PieChartSection(25, color=ft.Colors.BLUE, radius=80),
+                ft.PieChartSection(25, color=ft.Colors.YELLOW, radius=65),
+                ft.PieChartSection(25, color=ft.Colors.PINK, radius=60),
+                ft.PieChartSection(25, color=ft.Colors.GREEN, radius=70),
             ],
+            normal_style={"border_side": ft.BorderSide(0, ft.Colors.with_opacity(0, ft.Colors.WHITE))},
+            hover_style={"border_side": ft.BorderSide(6, ft.Colors.WHITE)},
             sections_space=1,
             center_space_radius=0,
-            on_chart_event=on_chart_event,
             expand=True,
         )
         
-        # 饼图 2
-        pie_chart2_normal_radius = 50
-        pie_chart2_hover_radius = 60
+        # 饼图 2：水果供应占比，悬停时放大扇区和标题
         pie_chart2_normal_title_style = ft.TextStyle(
             size=16, color=ft.Colors.WHITE, weight=ft.FontWeight.BOLD
         )
@@ -66,56 +63,16 @@ class ChartPage(BasePage):
             shadow=ft.BoxShadow(blur_radius=2, color=ft.Colors.BLACK54),
         )
 
-        def on_chart_event2(e: ft.PieChartEvent):
-            for idx, section in enumerate(self.pie_chart2.sections):
-                if idx == e.section_index:
-                    section.radius = pie_chart2_hover_radius
-                    section.title_style = pie_chart2_hover_title_style
-                else:
-                    section.radius = pie_chart2_normal_radius
-                    section.title_style = pie_chart2_normal_title_style
-            self.pie_chart2.update()
-
-        self.pie_chart2 = ft.PieChart(
-            sections=[
-                ft.PieChartSection(
-                    40,
-                    title="40%",
-                    title_style=pie_chart2_normal_title_style,
-                    color=ft.Colors.BLUE,
-                    radius=pie_chart2_normal_radius,
-                ),
-                ft.PieChartSection(
-                    30,
-                    title="30%",
-                    title_style=pie_chart2_normal_title_style,
-                    color=ft.Colors.YELLOW,
-                    radius=pie_chart2_normal_radius,
-                ),
-                ft.PieChartSection(
-                    15,
-                    title="15%",
-                    title_style=pie_chart2_normal_title_style,
-                    color=ft.Colors.PURPLE,
-                    radius=pie_chart2_normal_radius,
-                ),
-                ft.PieChartSection(
-                    15,
-                    title="15%",
-                    title_style=pie_chart2_normal_title_style,
-                    color=ft.Colors.GREEN,
-                    radius=pie_chart2_normal_radius,
-                ),
-            ],
+        self.pie_chart2 = InteractivePieChart(
+            sections=pie_sections(self.fruit_groups, colors=self.FRUIT_COLORS),
+            normal_style={"radius": 50, "title_style": pie_chart2_normal_title_style},
+            hover_style={"radius": 60, "title_style": pie_chart2_hover_title_style},
             sections_space=0,
             center_space_radius=40,
-            on_chart_event=on_chart_event2,
             expand=True,
         )
         
-        # 饼图 3
-        pie_chart3_normal_radius = 100
-        pie_chart3_hover_radius = 110
+        # 饼图 3：带图标徽章
         pie_chart3_normal_title_style = ft.TextStyle(
             size=12, color=ft.Colors.WHITE, weight=ft.FontWeight.BOLD
         )
@@ -137,58 +94,26 @@ class ChartPage(BasePage):
                 bgcolor=ft.Colors.WHITE,
             )
 
-        def on_chart_event(e: ft.PieChartEvent):
-            for idx, section in enumerate(self.pie_chart3.sections):
-                if idx == e.section_index:
-                    section.radius = pie_chart3_hover_radius
-                    section.title_style = pie_chart3_hover_title_style
-                else:
-                    section.radius = pie_chart3_normal_radius
-                    section.title_style = pie_chart3_normal_title_style
-            self.pie_chart3.update()
-
-        self.pie_chart3 = ft.PieChart(
+        self.pie_chart3 = InteractivePieChart(
             sections=[
                 ft.PieChartSection(
-                    40,
-                    title="40%",
-                    title_style=pie_chart3_normal_title_style,
-                    color=ft.Colors.BLUE,
-                    radius=pie_chart3_normal_radius,
-                    badge=badge(ft.Icons.AC_UNIT, pie_chart3_normal_badge_size),
-                    badge_position=0.98,
-                ),
-                ft.PieChartSection(
-                    30,
-                    title="30%",
-                    title_style=pie_chart3_normal_title_style,
-                    color=ft.Colors.YELLOW,
-                    radius=pie_chart3_normal_radius,
-                    badge=badge(ft.Icons.ACCESS_ALARM, pie_chart3_normal_badge_size),
-                    badge_position=0.98,
-                ),
-                ft.PieChartSection(
-                    15,
-                    title="15%",
-                    title_style=pie_chart3_normal_title_style,
-                    color=ft.Colors.PURPLE,
-                    radius=pie_chart3_normal_radius,
-                    badge=badge(ft.Icons.APPLE, pie_chart3_normal_badge_size),
+                    value,
+                    title=f"{value}%",
+                    color=color,
+                    badge=badge(icon, pie_chart3_normal_badge_size),
                     badge_position=0.98,
-                ),
-                ft.PieChartSection(
-                    15,
-                    title="15%",
-                    title_style=pie_chart3_normal_title_style,
-                    color=ft.Colors.GREEN,
-                    radius=pie_chart3_normal_radius,
-                    badge=badge(ft.Icons.PEDAL_BIKE, pie_chart3_normal_badge_size),
-                    badge_position=0.98,
-                ),
+                )
+                for value, color, icon in (
+                    (40, ft.Colors.BLUE, ft.Icons.AC_UNIT),
+                    (30, ft.Colors.YELLOW, ft.Icons.ACCESS_ALARM),
+                    (15, ft.Colors.PURPLE, ft.Icons.APPLE),
+                    (15, ft.Colors.GREEN, ft.Icons.PEDAL_BIKE),
+                )
             ],
+            normal_style={"radius": 100, "title_style": pie_chart3_normal_title_style},
+            hover_style={"radius": 110, "title_style": pie_chart3_hover_title_style},
             sections_space=0,
             center_space_radius=0,
-            on_chart_event=on_chart_event,
             expand=True,
         )
         
@@ -197,60 +122,103 @@ class ChartPage(BasePage):
             ft.Row([self.pie_chart1, self.pie_chart2, self.pie_chart3], spacing=10)
         )
     
+    def build_live_chart(self):
+        """实时折线图：模拟数据以 LIVE_SAMPLE_RATE 的频率写入，图表以 10 Hz 刷新"""
+        self.live_series = [
+            LiveSeries(self.LIVE_WINDOW, color=ft.Colors.CYAN, stroke_width=2),
+            LiveSeries(self.LIVE_WINDOW, color=ft.Colors.PINK, stroke_width=2),
+        ]
+        self.live_chart = ft.LineChart(
+            data_series=[series.line for series in self.live_series],
+            min_y=-2,
+            max_y=2,
+            interactive=False,
+            expand=True,
+            height=200,
+        )
+        if self.live_updater is not None:
+            self.live_updater.stop()
+            self._producer_stop.set()
+        self.live_updater = LiveChartUpdater(self.live_chart, self.live_series)
+        self.live_button = ft.FilledButton("开始", icon=ft.Icons.PLAY_ARROW, on_click=self.toggle_live)
+        return self.build_section("实时数据", ft.Column([self.live_button, self.live_chart], spacing=10))
+
+    def _produce_samples(self):
+        """模拟数据源，产生频率与图表刷新频率无关"""
+        interval = 1 / self.LIVE_SAMPLE_RATE
+        step = self.live_series[0].buffer.total
+        while not self._producer_stop.wait(interval):
+            t = step * interval
+            self.live_series[0].append(step, math.sin(t) + random.uniform(-0.2, 0.2))
+            self.live_series[1].append(step, math.cos(t * 0.7) * 0.8 + random.uniform(-0.2, 0.2))
+            step += 1
+
+    def toggle_live(self, e):
+        if self.live_updater.running:
+            self._producer_stop.set()
+            self.live_updater.stop()
+            self.live_button.text, self.live_button.icon = "开始", ft.Icons.PLAY_ARROW
+        else:
+            self._producer_stop = threading.Event()
+            threading.Thread(target=self._produce_samples, daemon=True).start()
+            self.live_updater.start()
+            self.live_button.text, self.live_button.icon = "停止", ft.Icons.PAUSE
+        self.live_button.update()
+
+    def chart_width(self) -> int:
+        """折线图可用的像素宽度，用于决定降采样后的点数"""
+        width = self.app.layout.width if self.app is not None else self.page.width
+        return int(width or self.DEFAULT_CHART_WIDTH)
+
+    def _handle_layout_change(self, width: float, height: float):
+        if self.chart_data is None:
+            return
+        series = self.data_2 if self.toggle else self.data_1
+        self.line_chart.data_series = [s.render(self.chart_width()) for s in series]
+        try:
+            self.line_chart.update()
+        except AssertionError:
+            # 图表当前没有显示
+            pass
+
     def toggle_data(self,e):
+        series = self.data_1 if self.toggle else self.data_2
+        self.line_chart.data_series = [s.render(self.chart_width()) for s in series]
         if self.toggle:
-            self.line_chart.data_series = self.data_1
             self.line_chart.max_y = 4
             self.line_chart.interactive = True
         else:
-            self.line_chart.data_series = self.data_2
-            self.line_chart.data_series[2].point = True
             self.line_chart.max_y = 6
             self.line_chart.interactive = False
         self.toggle = not self.toggle
         self.line_chart.update()
         
-    def build_content(self) -> ft.Control:
-        # 折线图数据1
-        self.data_1 = [
-            ft.LineChartData(
-                data_points=[
-                    ft.LineChartDataPoint(1, 1),
-                    ft.LineChartDataPoint(3, 1.5),
-                    ft.LineChartDataPoint(5, 1.4),
-                    ft.LineChartDataPoint(7, 3.4),
-                    ft.LineChartDataPoint(10, 2),
-                    ft.LineChartDataPoint(12, 2.2),
-                    ft.LineChartDataPoint(13, 1.8),
-                ],
+    def prepare_chart_data(self, token: CancelToken) -> dict:
+        """
+        准备图表数据，在后台线程中执行
+
+        数据量较大时汇总和降采样都比较耗时，放在后台避免阻塞界面；
+        页面被切换走时 token 会被取消，剩余的步骤不再执行
+        """
+        # 折线图数据1，LineSeries 按图表宽度对数据降采样
+        data_1 = [
+            LineSeries(
+                [(1, 1), (3, 1.5), (5, 1.4), (7, 3.4), (10, 2), (12, 2.2), (13, 1.8)],
                 stroke_width=8,
                 color=ft.Colors.LIGHT_GREEN,
                 curved=True,
                 stroke_cap_round=True,
             ),
-            ft.LineChartData(
-                data_points=[
-                    ft.LineChartDataPoint(1, 1),
-                    ft.LineChartDataPoint(3, 2.8),
-                    ft.LineChartDataPoint(7, 1.2),
-                    ft.LineChartDataPoint(10, 2.8),
-                    ft.LineChartDataPoint(12, 2.6),
-                    ft.LineChartDataPoint(13, 3.9),
-                ],
+            LineSeries(
+                [(1, 1), (3, 2.8), (7, 1.2), (10, 2.8), (12, 2.6), (13, 3.9)],
                 color=ft.Colors.PINK,
                 below_line_bgcolor=ft.Colors.with_opacity(0, ft.Colors.PINK),
                 stroke_width=8,
                 curved=True,
                 stroke_cap_round=True,
             ),
-            ft.LineChartData(
-                data_points=[
-                    ft.LineChartDataPoint(1, 2.8),
-                    ft.LineChartDataPoint(3, 1.9),
-                    ft.LineChartDataPoint(6, 3),
-                    ft.LineChartDataPoint(10, 1.3),
-                    ft.LineChartDataPoint(13, 2.5),
-                ],
+            LineSeries(
+                [(1, 2.8), (3, 1.9), (6, 3), (10, 1.3), (13, 2.5)],
                 color=ft.Colors.CYAN,
                 stroke_width=8,
                 curved=True,
@@ -259,53 +227,96 @@ class ChartPage(BasePage):
         ]
 
         # 折线图数据2
-        self.data_2 = [
-            ft.LineChartData(
-                data_points=[
-                    ft.LineChartDataPoint(1, 1),
-                    ft.LineChartDataPoint(3, 4),
-                    ft.LineChartDataPoint(5, 1.8),
-                    ft.LineChartDataPoint(7, 5),
-                    ft.LineChartDataPoint(10, 2),
-                    ft.LineChartDataPoint(12, 2.2),
-                    ft.LineChartDataPoint(13, 1.8),
-                ],
+        data_2 = [
+            LineSeries(
+                [(1, 1), (3, 4), (5, 1.8), (7, 5), (10, 2), (12, 2.2), (13, 1.8)],
                 stroke_width=4,
                 color=ft.Colors.with_opacity(0.5, ft.Colors.LIGHT_GREEN),
                 stroke_cap_round=True,
             ),
-            ft.LineChartData(
-                data_points=[
-                    ft.LineChartDataPoint(1, 1),
-                    ft.LineChartDataPoint(3, 2.8),
-                    ft.LineChartDataPoint(7, 1.2),
-                    ft.LineChartDataPoint(10, 2.8),
-                    ft.LineChartDataPoint(12, 2.6),
-                    ft.LineChartDataPoint(13, 3.9),
-                ],
+            LineSeries(
+                [(1, 1), (3, 2.8), (7, 1.2), (10, 2.8), (12, 2.6), (13, 3.9)],
                 color=ft.Colors.with_opacity(0.5, ft.Colors.PINK),
                 below_line_bgcolor=ft.Colors.with_opacity(0.2, ft.Colors.PINK),
                 stroke_width=4,
                 curved=True,
                 stroke_cap_round=True,
             ),
-            ft.LineChartData(
-                data_points=[
-                    ft.LineChartDataPoint(1, 3.8),
-                    ft.LineChartDataPoint(3, 1.9),
-                    ft.LineChartDataPoint(6, 5),
-                    ft.LineChartDataPoint(10, 3.3),
-                    ft.LineChartDataPoint(13, 4.5),
-                ],
+            LineSeries(
+                [(1, 3.8), (3, 1.9), (6, 5), (10, 3.3), (13, 4.5)],
                 color=ft.Colors.with_opacity(0.5, ft.Colors.CYAN),
                 stroke_width=4,
                 stroke_cap_round=True,
+                point=True,
             ),
         ]
 
+        token.raise_if_cancelled()
+        # 预先计算当前宽度的降采样结果，切换数据时直接使用缓存
+        width = self.chart_width()
+        for series in data_1 + data_2:
+            series.points(width)
+            token.raise_if_cancelled()
+
+        # 条形图和饼图 2 使用同一份汇总结果
+        fruit_groups = aggregate(self.FRUIT_RECORDS, category="fruit", value="amount", max_groups=self.MAX_GROUPS)
+        return {"data_1": data_1, "data_2": data_2, "fruit_groups": fruit_groups}
+
+    def on_show(self):
+        # 第一次显示时才开始准备数据，启动时不需要等待图表
+        if self.chart_data is None and self.chart_task is None:
+            self.chart_task = self.run_background(self.prepare_chart_data, on_done=self._on_chart_data_ready, on_error=self._on_chart_data_error)
+        if self.app is not None and self._unsubscribe_layout is None:
+            # 窗口宽度跨过断点时按新的宽度重新降采样
+            self._unsubscribe_layout = self.app.layout.subscribe(self._handle_layout_change)
+            # 隐藏期间窗口宽度可能已经变化
+            self._handle_layout_change(self.app.layout.width, self.app.layout.height)
+
+    def on_hide(self):
+        # 取消未完成的数据准备，下次显示时重新开始
+        super().on_hide()
+        self.chart_task = None
+        if self._unsubscribe_layout is not None:
+            self._unsubscribe_layout()
+            self._unsubscribe_layout = None
+        # 离开页面时停止实时图表
+        if self.live_updater is not None and self.live_updater.running:
+            self.toggle_live(None)
+
+    def _on_chart_data_ready(self, data: dict):
+        self.chart_data = data
+        self.chart_task = None
+        self.build_charts()
+        try:
+            self.chart_view.update()
+        except AssertionError:
+            # 页面尚未挂载
+            pass
+
+    def _on_chart_data_error(self, error: Exception):
+        self.chart_task = None
+        self.show_notification(f"加载图表数据失败: {str(error)}", type="error")
+
+    def build_skeleton(self, height: int) -> ft.Container:
+        """数据准备好之前显示的占位框"""
+        return ft.Container(
+            content=ft.ProgressRing(width=24, height=24, stroke_width=2),
+            alignment=ft.alignment.center,
+            height=height,
+            bgcolor=ft.Colors.with_opacity(0.05, self.theme_colors.text_color),
+            border_radius=ft.border_radius.all(8),
+        )
+
+    def build_charts(self):
+        """用准备好的数据创建图表，替换占位框"""
+        self.data_1 = self.chart_data["data_1"]
+        self.data_2 = self.chart_data["data_2"]
+        self.fruit_groups = self.chart_data["fruit_groups"]
+        self.toggle = False
+
         # 创建折线图
         self.line_chart = ft.LineChart(
-            data_series=self.data_1,
+            data_series=[series.render(self.chart_width()) for series in self.data_1],
             border=ft.Border(
                 bottom=ft.BorderSide(4, ft.Colors.with_opacity(0.5, ft.Colors.ON_SURFACE))
             ),
@@ -393,81 +404,16 @@ class ChartPage(BasePage):
             on_click=self.toggle_data,
         )
         
-        # 折线图
+        # 条形图，由原始供应记录按水果汇总
+        fruit_bars, fruit_labels = bar_groups(self.fruit_groups, colors=self.FRUIT_COLORS, border_radius=0)
         self.bar_chart = ft.BarChart(
-            bar_groups=[
-                ft.BarChartGroup(
-                    x=0,
-                    bar_rods=[
-                        ft.BarChartRod(
-                            from_y=0,
-                            to_y=40,
-                            width=40,
-                            color=ft.Colors.AMBER,
-                            tooltip="苹果",
-                            border_radius=0,
-                        ),
-                    ],
-                ),
-                ft.BarChartGroup(
-                    x=1,
-                    bar_rods=[
-                        ft.BarChartRod(
-                            from_y=0,
-                            to_y=100,
-                            width=40,
-                            color=ft.Colors.BLUE,
-                            tooltip="蓝莓",
-                            border_radius=0,
-                        ),
-                    ],
-                ),
-                ft.BarChartGroup(
-                    x=2,
-                    bar_rods=[
-                        ft.BarChartRod(
-                            from_y=0,
-                            to_y=30,
-                            width=40,
-                            color=ft.Colors.RED,
-                            tooltip="樱桃",
-                            border_radius=0,
-                        ),
-                    ],
-                ),
-                ft.BarChartGroup(
-                    x=3,
-                    bar_rods=[
-                        ft.BarChartRod(
-                            from_y=0,
-                            to_y=60,
-                            width=40,
-                            color=ft.Colors.ORANGE,
-                            tooltip="橙子",
-                            border_radius=0,
-                        ),
-                    ],
-                ),
-            ],
+            bar_groups=fruit_bars,
             border=ft.border.all(1, ft.Colors.GREY_400),
             left_axis=ft.ChartAxis(
                 labels_size=40, title=ft.Text("水果供应量"), title_size=40
             ),
             bottom_axis=ft.ChartAxis(
-                labels=[
-                    ft.ChartAxisLabel(
-                        value=0, label=ft.Container(ft.Text("苹果"), padding=10)
-                    ),
-                    ft.ChartAxisLabel(
-                        value=1, label=ft.Container(ft.Text("蓝莓"), padding=10)
-                    ),
-                    ft.ChartAxisLabel(
-                        value=2, label=ft.Container(ft.Text("樱桃"), padding=10)
-                    ),
-                    ft.ChartAxisLabel(
-                        value=3, label=ft.Container(ft.Text("橙子"), padding=10)
-                    ),
-                ],
+                labels=fruit_labels,
                 labels_size=40,
             ),
             horizontal_grid_lines=ft.ChartGridLines(
@@ -479,10 +425,23 @@ class ChartPage(BasePage):
             expand=True,
         )
         
-        self.content = ft.Column([
-            self.build_section("条形图", self.bar_chart),
-            self.build_section("折线图", ft.Column([self.toggle_button, self.line_chart], spacing=10)),
-            self.build_pie_chart(),
+        self.bar_holder.content = self.bar_chart
+        self.line_holder.content = ft.Column([self.toggle_button, self.line_chart], spacing=10)
+        self.pie_holder.content = self.build_pie_chart()
+
+    def build_content(self) -> ft.Control:
+        # 图表先显示占位框，数据在页面第一次显示时于后台准备
+        self.bar_holder = ft.Container(content=self.build_skeleton(250))
+        self.line_holder = ft.Container(content=self.build_skeleton(300))
+        self.pie_holder = ft.Container(content=self.build_section("饼图", self.build_skeleton(220)))
+        self.chart_view = ft.Column([
+            self.build_section("条形图", self.bar_holder),
+            self.build_section("折线图", self.line_holder),
+            self.build_live_chart(),
+            self.pie_holder,
         ], spacing=10, scroll=ft.ScrollMode.ADAPTIVE)
-        
-        return self.content
\ No newline at end of file
+        if self.chart_data is not None:
+            # 主题重建时数据已经准备好，直接创建图表
+            self.build_charts()
+
+        return self.chart_view
\ No newline at end of file
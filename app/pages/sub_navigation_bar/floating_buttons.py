@@ -1,136 +1,38 @@
-import asyncio
-import time
 import flet as ft
 from app.base import BasePage
+from app.pages.todo import TodoStatCards
 
 class FloatingPage(BasePage):
     """浮动按钮示例页面"""
     
     def __init__(self, **kwargs):
+        self.todo_stats = TodoStatCards()
         super().__init__(title="浮动按钮", **kwargs)
-        
-    def set_button_loading(self, button: ft.FloatingActionButton, is_loading: bool):
-        """
-        设置按钮的加载状态
-        
-        加载按钮动画
-        
-        要使用该方法，所有button在创建时必须设置width,否则显示不正常
-        """
-        if not hasattr(self, 'page') or not self.page or self.is_rebuilding():
-            return
-            
-        if is_loading:
-            # 创建一个环形加载动画
-            progress_ring = ft.ProgressRing(
-                width=16,
-                height=16,
-                stroke_width=2,
-                color=self.theme_colors.text_color,
-            )
-            button.content = ft.Row(
-                [
-                    progress_ring,
-                    ft.Text(
-                        button.text,
-                        color=self.theme_colors.text_color,
-                        size=14,
-                        weight=ft.FontWeight.W_500
-                    ),
-                ],
-                alignment=ft.MainAxisAlignment.CENTER,
-                spacing=10,
-            )
-        else:
-            # 恢复按钮原始状态
-            button.content = None
-            button.text = button.text  # 保持原有文本
-            # 如果要恢复原来的图标，可以添加以下代码
-            # button.icon = {
-            #     self.refresh_button: ft.Icons.REFRESH,
-            #     self.continue_button: ft.Icons.PLAY_ARROW,
-            #     self.stop_button: ft.Icons.STOP,
-            # }.get(button)
-        try:
-            button.update()
-        except AssertionError:
-            # 忽略在页面重建过程中的更新错误
-            pass
-    
-    async def start_loading(self, e):
-        """
-        异步的方式：加载按钮动画
-        
-        所有的点击事件都需要一个默认参数，所以添加e参数
-        """
-        self.set_button_loading(self.loading_button, True)
-        self.loading_button.disabled = True
-        self.show_dialog("按钮将被禁用，并且动画将持续10秒", "加载中")
-        await asyncio.sleep(10)
-        self.set_button_loading(self.loading_button, False)
-        self.loading_button.disabled = False
-        self.page.update()
-        
-    def start_loading_thread(self):
-        """
-        子线程的方式：加载按钮动画
-        
-        所有的点击事件都需要一个默认参数，所��添加e参数
-        """
-        self.set_button_loading(self.loading_button_thread, True)
-        self.loading_button_thread.disabled = True
-        self.show_dialog("按钮将被禁用，并且动画将持续10秒", "加载中")
-        time.sleep(10)
-        self.set_button_loading(self.loading_button_thread, False)
-        self.loading_button_thread.disabled = False
-        self.page.update()
+
+    def on_show(self):
+        self.todo_stats.start()
+
+    def on_hide(self):
+        super().on_hide()
+        self.todo_stats.pause()
 
     def _build_stats_section(self) -> ft.Container:
         """构建统计信息部分"""
-        # 活跃项目卡片
-        projects_card = ft.Container(
-            content=ft.Column([
-                ft.Text("Statistics", color=self.theme_colors.text_color, size=20),
-                ft.Text("125", color=self.theme_colors.text_color,
-                        size=40, weight="bold"),
-                ft.Text("Active Projects",
-                        color=self.theme_colors.text_color, size=14),
-            ]),
-            bgcolor=self.theme_colors.card_color,
-            padding=20,
-            border_radius=ft.border_radius.all(10),
-            width=200,
-            height=150,
-        )
-
-        # 待办任务卡片
-        tasks_card = ft.Container(
-            content=ft.Column([
-                ft.Text("Tasks", color=self.theme_colors.text_color, size=20),
-                ft.Text("42", color=self.theme_colors.text_color,
-                        size=40, weight="bold"),
-                ft.Text("Pending Tasks",
-                        color=self.theme_colors.text_color, size=14),
-            ]),
-            bgcolor=self.theme_colors.card_color,
-            padding=20,
-            border_radius=ft.border_radius.all(10),
-            width=200,
-            height=150,
-        )
+        # 统计卡片绑定到待办事项数据，轮询时只更新变化的数值
+        projects_card, tasks_card = self.todo_stats.build(self.app.todo_store, self.theme_colors)
         
         self.loading_button = ft.FloatingActionButton(
                     icon=ft.Icons.REFRESH,
-                    text="点击加载-异步",
+                    text="点击加载-可取消",
                     width=150,
-                    on_click=self.start_loading,
+                    on_click=lambda _: self.start_loading(self.loading_button),
                     height=30,
                 )
         self.loading_button_thread = ft.FloatingActionButton(
                     icon=ft.Icons.REFRESH,
-                    text="点击加载-线程",
+                    text="点击加载-后台",
                     width=150,
-                    on_click=lambda _: self.page.run_thread(self.start_loading_thread),
+                    on_click=lambda _: self.start_loading(self.loading_button_thread, cancel_on_hide=False),
                     height=30,
                     bgcolor=ft.Colors.GREEN
                 )
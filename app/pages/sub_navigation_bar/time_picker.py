@@ -1,34 +1,34 @@
 from datetime import datetime, timedelta
 import flet as ft
 from app.base import BasePage
+from components.event_log import EventLog
 
 class TimePickerPage(BasePage):
     """时间选择器示例页面"""
-    
+
+    EVENT_LOG_CAPACITY = 200
+
     def __init__(self, **kwargs):
+        # 事件日志最多保留 EVENT_LOG_CAPACITY 条记录，主题重建时保留已有记录
+        self.event_log = EventLog(capacity=self.EVENT_LOG_CAPACITY, height=200)
         super().__init__(title="时间选择", **kwargs)
     
     
     def handle_change(self, e):
-        self.content.controls.append(ft.Text(f"TimePicker change: {self.time_picker.value}"))
-        self.content.update()
+        self.event_log.log(f"TimePicker change: {self.time_picker.value}")
         
     def handle_dismissal(self, e):
-        self.content.controls.append(ft.Text(f"TimePicker dismissed: {self.time_picker.value}"))
-        self.content.update()
+        self.event_log.log(f"TimePicker dismissed: {self.time_picker.value}")
         
     def handle_entry_mode_change(self, e):
-        self.content.controls.append(ft.Text(f"TimePicker Entry mode changed to {e.entry_mode}"))
-        self.content.update()
+        self.event_log.log(f"TimePicker Entry mode changed to {e.entry_mode}")
         
     
     def handle_change_date(self, e):
-        self.content.controls.append(ft.Text(f"Date changed: {e.control.value.strftime('%Y-%m-%d')}"))
-        self.content.update()
+        self.event_log.log(f"Date changed: {e.control.value.strftime('%Y-%m-%d')}")
 
     def handle_dismissal_date(self, e):
-        self.content.controls.append(ft.Text("DatePicker dismissed"))
-        self.content.update()
+        self.event_log.log("DatePicker dismissed")
         
     def build_content(self) -> ft.Control:
         self.time_picker = ft.TimePicker(
@@ -62,9 +62,8 @@ class TimePickerPage(BasePage):
                     visible=True
                 )
         
-        self.content = ft.Column([
+        return self.build_section("时间选择器", ft.Column([
             ft.Row([ self.date_picker_button, ft.Container(width=300), self.time_picker_button], alignment=ft.MainAxisAlignment.CENTER),
-            self.date_picker_range
-            ], spacing=10)
-        
-        return self.build_section("时间选择器", self.content)
+            self.date_picker_range,
+            self.event_log,
+            ], spacing=10))
@@ -1,24 +1,33 @@
+import heapq
+from typing import Callable, Dict, List
 import flet as ft
 
 from app.base import BasePage
+from app.config.theme import ThemeColors
+from app.utils.todo_store import TodoItem, TodoModel, TodoStore, format_task_text
+from components.stat_card import StatCard, StatsPoller
+
+# 统计卡片的刷新间隔（秒）
+STATS_POLL_INTERVAL = 5
 
 class Task(ft.Column):
-    def __init__(self, task_name, task_status_change, task_delete):
+    def __init__(self, item: TodoItem, task_status_change, task_delete, task_rename):
         super().__init__()
-        self.completed = False
-        self.task_name = task_name
         self.task_status_change = task_status_change
         self.task_delete = task_delete
-        self.display_task = ft.Checkbox(
-            value=False, label=self.task_name, on_change=self.status_changed
-        )
-        self.edit_name = ft.TextField(expand=1)
+        self.task_rename = task_rename
+        self.display_task = ft.Checkbox(on_change=self.status_changed)
+        # 标签和截止日期
+        self.meta_text = ft.Text(size=12, opacity=0.6)
+        # 编辑行在第一次编辑时才创建
+        self.edit_name = None
+        self.edit_view = None
 
         self.display_view = ft.Row(
             alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
             vertical_alignment=ft.CrossAxisAlignment.CENTER,
             controls=[
-                self.display_task,
+                ft.Row([self.display_task, self.meta_text], spacing=10, expand=True),
                 ft.Row(
                     spacing=0,
                     controls=[
@@ -36,7 +45,27 @@ class Task(ft.Column):
                 ),
             ],
         )
+        self.controls = [self.display_view]
+        self.bind(item)
+
+    def bind(self, item: TodoItem):
+        """绑定任务数据，回收的行控件通过此方法复用到其他任务"""
+        self.item = item
+        self.completed = item.completed
+        self.task_name = item.name
+        self.display_task.value = item.completed
+        self.display_task.label = item.name
+        meta = [f"#{tag}" for tag in item.tags]
+        if item.due_date:
+            meta.append(f"截止 {item.due_date}")
+        self.meta_text.value = " ".join(meta)
+        self.meta_text.visible = bool(meta)
+        self.display_view.visible = True
+        if self.edit_view is not None:
+            self.edit_view.visible = False
 
+    def _build_edit_view(self):
+        self.edit_name = ft.TextField(expand=1)
         self.edit_view = ft.Row(
             visible=False,
             alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
@@ -51,18 +80,20 @@ class Task(ft.Column):
                 ),
             ],
         )
-        self.controls = [self.display_view, self.edit_view]
+        self.controls.append(self.edit_view)
 
     def edit_clicked(self, e):
-        self.edit_name.value = self.display_task.label
+        if self.edit_view is None:
+            self._build_edit_view()
+        self.edit_name.value = format_task_text(self.item)
         self.display_view.visible = False
         self.edit_view.visible = True
         self.update()
 
     def save_clicked(self, e):
-        self.display_task.label = self.edit_name.value
         self.display_view.visible = True
         self.edit_view.visible = False
+        self.task_rename(self, self.edit_name.value)
         self.update()
 
     def status_changed(self, e):
@@ -75,12 +106,35 @@ class Task(ft.Column):
 
 class TodoApp(ft.Column):
     # application's root control is a Column containing all other controls
-    def __init__(self):
+    # 每次从存储中加载的任务数量
+    PAGE_SIZE = 100
+    # 标签页对应的完成状态，None 表示全部
+    STATUS_FILTERS = {"全部": None, "未完成": False, "已完成": True}
+
+    def __init__(self, store: TodoStore, on_event: Callable[[str], None] = None):
         super().__init__()
+        self.model = TodoModel(store)
+        # 任务增删改后的回调 on_event(描述)，例如记录到活动日志
+        self.on_event = on_event
+        # 已加载任务的控件，按任务 id 索引
+        self.task_controls: Dict[int, Task] = {}
+        # 搜索结果的行控件，按任务 id 索引
+        self.search_controls: Dict[int, Task] = {}
+        # 被删除任务的行控件，新任务优先复用
+        self._row_pool: List[Task] = []
         self.new_task = ft.TextField(
-            hint_text="请输入任务名称", on_submit=self.add_clicked, expand=True
+            hint_text="请输入任务名称，可添加 #标签 和 @2024-01-31 截止日期", on_submit=self.add_clicked, expand=True
         )
-        self.tasks = ft.Column()
+        self.search_box = ft.TextField(
+            hint_text="搜索任务，支持 #标签 和 @日期（截止日期不晚于）",
+            prefix_icon=ft.Icons.SEARCH,
+            on_change=self.search_changed,
+            dense=True,
+        )
+        # ListView 只渲染可见范围内的行，并负责滚动加载下一页
+        self.tasks = ft.ListView(expand=True, spacing=0, on_scroll=self.tasks_scrolled)
+        self.search_results = ft.ListView(expand=True, spacing=0, visible=False)
+        self.search_info = ft.Text(size=12, opacity=0.6, visible=False)
 
         self.filter = ft.Tabs(
             scrollable=False,
@@ -90,10 +144,10 @@ class TodoApp(ft.Column):
         )
 
         self.items_left = ft.Text("0 项未完成")
+        self._status = self.STATUS_FILTERS[self.filter.tabs[self.filter.selected_index].text]
 
         self.width = 700
         self.height = 700
-        self.scroll = ft.ScrollMode.AUTO
         self.controls = [
             ft.Row(
                 [ft.Text(value="待办事项", theme_style=ft.TextThemeStyle.HEADLINE_MEDIUM)],
@@ -109,9 +163,13 @@ class TodoApp(ft.Column):
             ),
             ft.Column(
                 spacing=25,
+                expand=True,
                 controls=[
+                    self.search_box,
                     self.filter,
+                    self.search_info,
                     self.tasks,
+                    self.search_results,
                     ft.Row(
                         alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                         vertical_alignment=ft.CrossAxisAlignment.CENTER,
@@ -124,14 +182,80 @@ class TodoApp(ft.Column):
                     ),
                     ft.TextButton("访问 文档", icon=ft.Icons.OPEN_IN_NEW, url="https://flet.qiannianlu.com/docs/tutorials/python-todo")
                 ],
-                scroll=ft.ScrollMode.AUTO,
             ),
         ]
 
+        # 从存储中加载第一页任务
+        self.fill_page()
+        self._refresh_items_left()
+
+    def _new_row(self, item: TodoItem) -> Task:
+        if self._row_pool:
+            task = self._row_pool.pop()
+            task.bind(item)
+        else:
+            task = Task(item, self.task_status_change, self.task_delete, self.task_rename)
+        task.visible = self._is_visible(task)
+        return task
+
+    def _create_task(self, item: TodoItem) -> Task:
+        task = self._new_row(item)
+        self.task_controls[item.id] = task
+        return task
+
+    def _rows_of(self, item_id: int) -> List[Task]:
+        """任务在主列表和搜索结果中对应的行控件"""
+        return [rows[item_id] for rows in (self.task_controls, self.search_controls) if item_id in rows]
+
+    def _recycle(self, task: Task):
+        # 回收池最多保留一页的行控件
+        if len(self._row_pool) < self.PAGE_SIZE:
+            self._row_pool.append(task)
+
+    def _is_visible(self, task: Task) -> bool:
+        return self._status is None or task.completed == self._status
+
+    def _refresh_items_left(self):
+        # 计数由模型增量维护，包含尚未加载的任务
+        self.items_left.value = f"{self.model.active_count} 项未完成"
+
+    def _insert_rows(self, tasks: List[Task]):
+        # 列表按任务 id 排序，按状态加载的页和新增的任务都合并到对应位置
+        self.tasks.controls = list(heapq.merge(self.tasks.controls, tasks, key=lambda task: task.item.id))
+
+    def _visible_count(self) -> int:
+        if self._status is None:
+            return len(self.model.items)
+        return len(self.model.ids_with_status(self._status))
+
+    def load_more(self) -> bool:
+        """从存储中加载当前标签页状态的下一页任务，返回是否加载了新任务"""
+        items = self.model.load_more(limit=self.PAGE_SIZE, completed=self._status)
+        self._insert_rows([self._create_task(item) for item in items])
+        return bool(items)
+
+    def fill_page(self):
+        """加载任务直到可见的行足够一页或者没有更多任务，否则列表无法滚动，也就不会继续加载"""
+        while self._visible_count() < self.PAGE_SIZE and self.model.has_more_with_status(self._status):
+            self.load_more()
+
+    def tasks_scrolled(self, e: ft.OnScrollEvent):
+        # 滚动到接近底部时再加载下一页
+        if e.pixels >= e.max_scroll_extent - 100 and self.load_more():
+            self.update()
+
+    def _notify(self, message: str):
+        if self.on_event:
+            self.on_event(message)
+
     def add_clicked(self, e):
         if self.new_task.value:
-            task = Task(self.new_task.value, self.task_status_change, self.task_delete)
-            self.tasks.controls.append(task)
+            item = self.model.add(self.new_task.value)
+            # 先记录活动，与任务行是否显示无关
+            self._notify(f"添加任务 {item.name}")
+            # 新任务的 id 最大，位于列表末尾
+            self.tasks.controls.append(self._create_task(item))
+            self._refresh_items_left()
             self.new_task.value = ""
             self.new_task.error_text = None
             self.new_task.focus()
@@ -141,36 +265,114 @@ class TodoApp(ft.Column):
             self.update()
 
     def task_status_change(self, task):
+        if self.model.set_completed(task.item, task.completed):
+            for row in self._rows_of(task.item.id):
+                row.bind(task.item)
+                row.visible = self._is_visible(row)
+            if task.item.id in self.model.items and task.item.id not in self.task_controls:
+                # 搜索结果中的任务改为新状态后加入了已加载的任务
+                self._insert_rows([self._create_task(task.item)])
+            self._refresh_items_left()
+            # 当前标签页的任务被改为其他状态后补足可见的行
+            self.fill_page()
+            self._notify(f"{'完成' if task.completed else '重新打开'}任务 {task.item.name}")
         self.update()
 
+    def task_rename(self, task, text):
+        self.model.update(task.item, text)
+        for row in self._rows_of(task.item.id):
+            row.bind(task.item)
+        self._notify(f"修改任务 {task.item.name}")
+
     def task_delete(self, task):
-        self.tasks.controls.remove(task)
+        item_id = task.item.id
+        self.model.delete(task.item)
+        self._notify(f"删除任务 {task.item.name}")
+        for rows, view in ((self.task_controls, self.tasks), (self.search_controls, self.search_results)):
+            row = rows.pop(item_id, None)
+            if row is not None:
+                view.controls.remove(row)
+                self._recycle(row)
+        self._refresh_items_left()
+        self.update()
+
+    def search_changed(self, e):
+        query = self.search_box.value.strip()
+        for row in self.search_controls.values():
+            self._recycle(row)
+        self.search_controls = {}
+        if query:
+            items, total = self.model.search(query, limit=self.PAGE_SIZE)
+            self.search_controls = {item.id: self._new_row(item) for item in items}
+            self.search_info.value = f"找到 {total} 项" + (f"，显示前 {len(items)} 项" if total > len(items) else "")
+        self.search_results.controls = list(self.search_controls.values())
+        self.search_results.visible = self.search_info.visible = bool(query)
+        self.tasks.visible = not query
         self.update()
 
     def tabs_changed(self, e):
+        status = self.STATUS_FILTERS[self.filter.tabs[self.filter.selected_index].text]
+        previous, self._status = self._status, status
+        # 只更新可见性发生变化的那一组任务
+        for completed in (False, True):
+            was_visible = previous is None or previous == completed
+            is_visible = status is None or status == completed
+            if was_visible != is_visible:
+                for item_id in self.model.ids_with_status(completed):
+                    self.task_controls[item_id].visible = is_visible
+        for row in self.search_controls.values():
+            row.visible = self._is_visible(row)
+        # 已加载的任务中该状态的行不够时按状态继续加载
+        self.fill_page()
         self.update()
 
     def clear_clicked(self, e):
-        for task in self.tasks.controls[:]:
-            if task.completed:
-                self.task_delete(task)
-
-    def before_update(self):
-        status = self.filter.tabs[self.filter.selected_index].text
-        count = 0
-        for task in self.tasks.controls:
-            task.visible = (
-                status == "全部"
-                or (status == "未完成" and not task.completed)
-                or (status == "已完成" and task.completed)
-            )
-            if not task.completed:
-                count += 1
-        self.items_left.value = f"{count} 项未完成"
+        cleared = self.model.clear_completed()
+        if cleared:
+            self._notify(f"清除 {len(cleared)} 项已完成任务")
+            for rows, view in ((self.task_controls, self.tasks), (self.search_controls, self.search_results)):
+                for item_id in cleared:
+                    task = rows.pop(item_id, None)
+                    if task is not None:
+                        self._recycle(task)
+                view.controls = [task for task in view.controls if task.item.id not in cleared]
+        self._refresh_items_left()
+        self.update()
+
+class TodoStatCards:
+    """
+    已完成和未完成任务数量的统计卡片，首页和浮动按钮页共用
+
+    卡片由 StatsPoller 轮询 TodoStore，只更新变化的数值；
+    页面显示时调用 start，隐藏后调用 pause 降低刷新频率
+    """
+
+    def __init__(self, interval: float = STATS_POLL_INTERVAL):
+        self.poller = StatsPoller(interval=interval)
+
+    def build(self, store: TodoStore, theme_colors: ThemeColors) -> List[StatCard]:
+        """创建卡片并绑定到任务数量，主题重建时再次调用会替换之前的卡片"""
+        cards = []
+        for key, title, label, completed in (
+            ("completed", "Statistics", "Completed Tasks", True),
+            ("pending", "Tasks", "Pending Tasks", False),
+        ):
+            card = StatCard(title, label, text_color=theme_colors.text_color, bgcolor=theme_colors.card_color)
+            self.poller.bind(key, card, lambda completed=completed: store.count(completed=completed))
+            cards.append(card)
+        return cards
+
+    def start(self):
+        self.poller.start()
+
+    def pause(self):
+        self.poller.pause()
 
 class TodoPage(BasePage):
-    def __init__(self, **kwargs):
-        super().__init__(title="Todo", **kwargs)
+    def __init__(self, app, **kwargs):
+        # 任务保存在配置目录下，主题重建时从存储重新加载
+        self.store = app.todo_store
+        super().__init__(title="Todo", app=app, **kwargs)
     
     def build_content(self):
-        return ft.Row(controls=[TodoApp()], alignment=ft.MainAxisAlignment.CENTER, height=500)
+        return ft.Row(controls=[TodoApp(self.store, on_event=lambda message: self.app.activity_log.append("todo", message))], alignment=ft.MainAxisAlignment.CENTER, height=500)
@@ -0,0 +1,144 @@
+import json
+import os
+import struct
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from .file_lock import FileLock
+
+# 偏移索引中每条记录占 8 字节（无符号小端整数）
+_OFFSET = struct.Struct("<Q")
+
+
+class ActivityEntry(NamedTuple):
+    seq: int
+    kind: str
+    title: str
+    timestamp: float
+
+
+class ActivityLog:
+    """
+    活动日志
+
+    记录以 JSON Lines 追加到日志文件，同时把每条记录的起始偏移写入定长的索引文件。
+    第 n 条记录的偏移位于索引文件的 n * 8 处，读取最新的若干条记录时只需读取索引末尾
+    和日志末尾对应的一段，耗时与文件大小无关。
+    先写日志再写索引，写入中断时下一次写入前会为日志末尾未建索引的记录补建索引。
+    同时运行的多个应用实例共用日志文件，读写都在 .lock 文件锁内进行，
+    写入的偏移和记录数取自文件大小而不是本实例的内存状态
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self._lock = FileLock(f"{path}.lock")
+        # 新增记录时的回调，例如刷新首页的活动列表
+        self.on_append: Optional[Callable[[ActivityEntry], None]] = None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._log = open(path, "ab")
+        self._index = open(self.index_path, "ab")
+        with self._lock:
+            self._repair()
+
+    def _repair(self):
+        """丢弃不完整的索引项，并为日志末尾未建索引的记录补建索引，需要在文件锁内调用"""
+        index_size = os.path.getsize(self.index_path)
+        if index_size % _OFFSET.size:
+            index_size -= index_size % _OFFSET.size
+            self._index.truncate(index_size)
+        log_size = os.path.getsize(self.path)
+        with open(self.index_path, "rb") as f:
+            # 去掉指向日志末尾之后的索引项（日志被截断时）
+            while index_size:
+                f.seek(index_size - _OFFSET.size)
+                last = _OFFSET.unpack(f.read(_OFFSET.size))[0]
+                if last < log_size:
+                    break
+                index_size -= _OFFSET.size
+        if index_size != os.path.getsize(self.index_path):
+            self._index.truncate(index_size)
+        self._count = index_size // _OFFSET.size
+
+        with open(self.path, "rb") as f:
+            if self._count:
+                f.seek(last)
+                f.readline()
+            missing = []
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if line.endswith(b"\n"):
+                    missing.append(offset)
+                else:
+                    # 最后一行没有写完，截掉以免与下一条记录连在一起
+                    self._log.truncate(offset)
+        # 截断后重新定位到文件末尾，tell() 才是下一条记录的偏移
+        self._log.seek(0, os.SEEK_END)
+        self._index.seek(0, os.SEEK_END)
+        if missing:
+            self._index.write(b"".join(_OFFSET.pack(offset) for offset in missing))
+            self._index.flush()
+            self._count += len(missing)
+
+    def __len__(self) -> int:
+        return os.path.getsize(self.index_path) // _OFFSET.size
+
+    def append(self, kind: str, title: str) -> ActivityEntry:
+        """
+        追加一条记录
+
+        :param kind: 记录类型，例如 navigation、config、todo
+        """
+        timestamp = time.time()
+        line = json.dumps({"kind": kind, "title": title, "timestamp": timestamp}, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._lock:
+            # 其他实例可能已经追加了记录，先补齐索引，再以文件的实际大小作为偏移
+            self._repair()
+            offset = os.fstat(self._log.fileno()).st_size
+            self._log.write(line)
+            self._log.flush()
+            self._index.write(_OFFSET.pack(offset))
+            self._index.flush()
+            entry = ActivityEntry(self._count, kind, title, timestamp)
+            self._count += 1
+        if self.on_append:
+            self.on_append(entry)
+        return entry
+
+    def page(self, before: Optional[int] = None, limit: int = 50) -> List[ActivityEntry]:
+        """
+        按从新到旧的顺序读取记录
+
+        :param before: 只返回序号小于 before 的记录，为 None 时从最新的记录开始
+        """
+        with self._lock:
+            count = os.path.getsize(self.index_path) // _OFFSET.size
+            end = count if before is None else max(0, min(before, count))
+            start = max(0, end - limit)
+            if start == end:
+                return []
+            with open(self.index_path, "rb") as f:
+                f.seek(start * _OFFSET.size)
+                offsets = [value for (value,) in _OFFSET.iter_unpack(f.read((end - start + 1) * _OFFSET.size))]
+            with open(self.path, "rb") as f:
+                f.seek(offsets[0])
+                # 读到下一条记录的起始位置，最新的一页则读到文件末尾
+                data = f.read(offsets[-1] - offsets[0]) if len(offsets) > end - start else f.read()
+        entries = []
+        for seq, line in enumerate(data.splitlines(), start):
+            try:
+                record = json.loads(line)
+                entries.append(ActivityEntry(seq, record["kind"], record["title"], record.get("timestamp", 0.0)))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                # 跳过损坏的行
+                continue
+        entries.reverse()
+        return entries
+
+    def close(self):
+        with self._lock:
+            self._log.close()
+            self._index.close()
@@ -0,0 +1,325 @@
+import re
+from decimal import Decimal, DivisionByZero, InvalidOperation, localcontext
+from functools import lru_cache
+from typing import List, Optional, Union
+
+Token = Union[str, Decimal]
+
+# 运算符优先级和结合性，neg 为一元负号，% 为后缀百分号
+_PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2, "neg": 3, "%": 4}
+_RIGHT_ASSOCIATIVE = {"neg"}
+_BINARY_OPERATORS = ("+", "-", "*", "/")
+_TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*|\.\d+)|(.))")
+# 计算精度（有效数字位数）
+PRECISION = 28
+
+
+class CalcError(ValueError):
+    """表达式无法计算，例如语法错误或除以零"""
+
+
+def tokenize(expression: str) -> List[Token]:
+    """
+    将表达式切分为数字和运算符
+
+    数字转换为 Decimal，避免浮点误差；出现在开头、运算符或左括号之后的 - 视为一元负号
+    """
+    tokens: List[Token] = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_RE.match(expression, position)
+        number, symbol = match.groups()
+        position = match.end()
+        if number is not None:
+            tokens.append(Decimal(number))
+        elif symbol in "+-*/%()":
+            previous = tokens[-1] if tokens else None
+            if symbol in "+-" and (previous is None or (isinstance(previous, str) and previous not in (")", "%"))):
+                # 一元正号直接忽略
+                if symbol == "-":
+                    tokens.append("neg")
+            else:
+                tokens.append(symbol)
+        elif symbol in "×÷":
+            tokens.append("*" if symbol == "×" else "/")
+        else:
+            raise CalcError(f"无法识别的字符: {symbol}")
+    return tokens
+
+
+def to_rpn(tokens: List[Token]) -> List[Token]:
+    """调度场算法：将中缀表达式转换为逆波兰表达式，时间复杂度 O(n)"""
+    output: List[Token] = []
+    operators: List[str] = []
+    for token in tokens:
+        if isinstance(token, Decimal):
+            output.append(token)
+        elif token == "%":
+            # 后缀运算符直接作用于已输出的操作数
+            output.append(token)
+        elif token == "(":
+            operators.append(token)
+        elif token == ")":
+            while operators and operators[-1] != "(":
+                output.append(operators.pop())
+            if not operators:
+                raise CalcError("括号不匹配")
+            operators.pop()
+        else:
+            while operators and operators[-1] != "(" and (
+                _PRECEDENCE[operators[-1]] > _PRECEDENCE[token]
+                or (_PRECEDENCE[operators[-1]] == _PRECEDENCE[token] and token not in _RIGHT_ASSOCIATIVE)
+            ):
+                output.append(operators.pop())
+            operators.append(token)
+    while operators:
+        operator = operators.pop()
+        if operator == "(":
+            raise CalcError("括号不匹配")
+        output.append(operator)
+    return output
+
+
+def evaluate_rpn(rpn: List[Token]) -> Decimal:
+    """计算逆波兰表达式"""
+    stack: List[Decimal] = []
+    with localcontext() as context:
+        context.prec = PRECISION
+        context.traps[DivisionByZero] = True
+        try:
+            for token in rpn:
+                if isinstance(token, Decimal):
+                    stack.append(token)
+                elif token == "neg":
+                    stack.append(-stack.pop())
+                elif token == "%":
+                    stack.append(stack.pop() / 100)
+                else:
+                    right = stack.pop()
+                    left = stack.pop()
+                    if token == "+":
+                        stack.append(left + right)
+                    elif token == "-":
+                        stack.append(left - right)
+                    elif token == "*":
+                        stack.append(left * right)
+                    else:
+                        stack.append(left / right)
+        except IndexError:
+            raise CalcError("表达式不完整")
+        except (DivisionByZero, InvalidOperation):
+            raise CalcError("除数不能为零")
+    if len(stack) != 1:
+        raise CalcError("表达式不完整")
+    return stack[0]
+
+
+@lru_cache(maxsize=256)
+def evaluate(expression: str) -> Decimal:
+    """计算表达式，相同表达式的结果会被缓存"""
+    return evaluate_rpn(to_rpn(tokenize(expression)))
+
+
+def format_decimal(value: Decimal) -> str:
+    """格式化计算结果：去掉多余的 0，不使用科学计数法"""
+    if value == 0:
+        return "0"
+    return f"{value.normalize():f}"
+
+
+class CalculatorEngine:
+    """
+    计算器引擎
+
+    负责按键输入、表达式计算、撤销和历史记录，不依赖 Flet 控件，可以单独测试。
+    已输入的数字和运算符保存在 tokens 中，正在输入的数字保存在 entry 中
+    """
+
+    def __init__(self, history=None):
+        """
+        :param history: 历史记录容器，需要支持 append((表达式, 结果))，默认使用列表
+        """
+        self.tokens: List[str] = []
+        self.entry = ""
+        self.result: Optional[str] = None  # 上一次计算的结果，开始新输入前有效
+        self.last_expression = ""  # 与 result 对应的表达式
+        self.error = False
+        self.history = history if history is not None else []
+        self._undo_stack: List[tuple] = []
+
+    # 显示
+    @property
+    def display(self) -> str:
+        """结果区域显示的内容"""
+        if self.error:
+            return "Error"
+        if self.entry:
+            return self.entry
+        if self.result is not None:
+            return self.result
+        for token in reversed(self.tokens):
+            if token not in _BINARY_OPERATORS:
+                return token
+        return "0"
+
+    @property
+    def formula(self) -> str:
+        """公式区域显示的内容"""
+        if self.result is not None and self.last_expression:
+            return f"{self.last_expression} = {self.result}"
+        return self.expression
+
+    @property
+    def expression(self) -> str:
+        parts = self.tokens + [self.entry] if self.entry else self.tokens
+        return " ".join(parts)
+
+    # 撤销
+    def _snapshot(self, full: bool = False):
+        """
+        记录撤销点
+
+        大多数输入只会追加或替换最后一个 token，因此只记录长度和最后一个 token，
+        避免长表达式每次输入都复制整个列表
+        """
+        tokens = tuple(self.tokens) if full else (len(self.tokens), self.tokens[-1] if self.tokens else None)
+        self._undo_stack.append((full, tokens, self.entry, self.result, self.last_expression, self.error))
+
+    def undo(self) -> bool:
+        """撤销上一次输入，返回是否有可撤销的操作"""
+        if not self._undo_stack:
+            return False
+        full, tokens, self.entry, self.result, self.last_expression, self.error = self._undo_stack.pop()
+        if full:
+            self.tokens = list(tokens)
+        else:
+            length, last = tokens
+            del self.tokens[length:]
+            if length:
+                self.tokens[length - 1] = last
+        return True
+
+    # 输入
+    def _start_new_calculation(self):
+        if self.result is not None or self.error:
+            self.tokens = []
+            self.result = None
+            self.error = False
+
+    def _continue_from_result(self):
+        # 计算后直接输入运算符时，以上一次的结果作为第一个操作数
+        if self.result is not None:
+            self.tokens = [self.result]
+            self.result = None
+        elif self.error:
+            self.tokens = []
+            self.error = False
+
+    def input_digit(self, digit: str):
+        if digit == "." and "." in self.entry:
+            return
+        self._snapshot(full=self.result is not None or self.error)
+        self._start_new_calculation()
+        if digit == ".":
+            self.entry = (self.entry or "0") + "."
+        elif self.entry in ("0", "-0"):
+            self.entry = self.entry[:-1] + digit
+        else:
+            self.entry += digit
+
+    def input_operator(self, operator: str):
+        if operator not in _BINARY_OPERATORS:
+            raise CalcError(f"未知运算符: {operator}")
+        self._snapshot(full=self.result is not None or self.error)
+        self._continue_from_result()
+        if self.entry:
+            self.tokens.append(self.entry)
+            self.entry = ""
+        if not self.tokens:
+            self.tokens.append("0")
+        if self.tokens[-1] in _BINARY_OPERATORS:
+            # 连续输入运算符时替换上一个
+            self.tokens[-1] = operator
+        else:
+            self.tokens.append(operator)
+
+    def _transform_operand(self, transform):
+        """对当前操作数（正在输入的数字或上一次的结果）进行变换"""
+        self._snapshot(full=self.result is not None)
+        if not self.entry and self.result is not None:
+            self.entry = self.result
+            self.tokens = []
+            self.result = None
+        if not self.entry:
+            self.entry = "0"
+        self.entry = transform(self.entry)
+
+    def toggle_sign(self):
+        self._transform_operand(lambda entry: entry[1:] if entry.startswith("-") else "-" + entry)
+
+    def percent(self):
+        self._transform_operand(lambda entry: format_decimal(Decimal(entry) / 100))
+
+    def clear(self):
+        self._snapshot(full=True)
+        self.tokens = []
+        self.entry = ""
+        self.result = None
+        self.error = False
+
+    def load(self, expression: str):
+        """载入一个完整的表达式（例如粘贴的文本）并计算"""
+        self._snapshot(full=True)
+        self.tokens = [expression.strip()] if expression.strip() else []
+        self.entry = ""
+        self.result = None
+        self.error = False
+        return self.equals(snapshot=False)
+
+    def equals(self, snapshot: bool = True) -> Optional[str]:
+        """计算当前表达式，返回结果；表达式有误时返回 None"""
+        if self.result is not None or self.error:
+            return self.result
+        if snapshot:
+            self._snapshot(full=True)
+        if self.entry:
+            self.tokens.append(self.entry)
+            self.entry = ""
+        # 末尾多余的运算符忽略
+        if self.tokens and self.tokens[-1] in _BINARY_OPERATORS:
+            self.tokens.pop()
+        expression = self.expression
+        if not expression:
+            return None
+        try:
+            self.result = format_decimal(evaluate(expression))
+        except CalcError:
+            self.error = True
+            self.tokens = []
+            return None
+        self.last_expression = expression
+        self.history.append((expression, self.result))
+        self.tokens = []
+        return self.result
+
+    def recall(self, value: str):
+        """将历史结果作为当前输入的数字"""
+        self._snapshot(full=True)
+        self._start_new_calculation()
+        self.entry = value
+
+    def press(self, key: str):
+        """按键输入，key 与计算器按钮上的文字一致"""
+        if key == "AC":
+            self.clear()
+        elif key in "0123456789." and len(key) == 1:
+            self.input_digit(key)
+        elif key in _BINARY_OPERATORS:
+            self.input_operator(key)
+        elif key == "=":
+            self.equals()
+        elif key == "%":
+            self.percent()
+        elif key == "+/-":
+            self.toggle_sign()
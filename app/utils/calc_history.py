@@ -0,0 +1,113 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+
+class HistoryEntry(NamedTuple):
+    expression: str
+    result: str
+    timestamp: float
+
+
+class CalcHistoryStore:
+    """
+    计算历史存储
+
+    内存中使用有界环形缓冲区保存最近的记录，新记录先进入待写队列，
+    累积到 batch_size 条或超过 flush_interval 秒后一次性追加到 JSON Lines 文件。
+    启动时只从文件末尾读取最近 capacity 条记录，文件再大也不会拖慢加载
+    """
+
+    # 文件超过该大小时，启动加载后用缓冲区内容重写文件
+    COMPACT_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, path: str, capacity: int = 5000, batch_size: int = 20, flush_interval: float = 2.0):
+        self.path = path
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._entries: deque = deque(maxlen=capacity)
+        self._pending: List[HistoryEntry] = []
+        self._lock = threading.Lock()
+        self._flush_timer = None
+        # 新增记录时的回调，例如刷新历史面板
+        self.on_append: Optional[Callable[[HistoryEntry], None]] = None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._load()
+        atexit.register(self.flush)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        for line in self._read_tail_lines(self.capacity):
+            try:
+                data = json.loads(line)
+                self._entries.append(HistoryEntry(data["expression"], data["result"], data.get("timestamp", 0.0)))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                # 跳过损坏的行（例如写入过程中被中断）
+                continue
+        if os.path.getsize(self.path) > self.COMPACT_SIZE:
+            self._rewrite()
+
+    def _read_tail_lines(self, count: int, block_size: int = 64 * 1024) -> List[str]:
+        """从文件末尾向前按块读取，返回最后 count 行"""
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b""
+            while position > 0 and data.count(b"\n") <= count:
+                read_size = min(block_size, position)
+                position -= read_size
+                f.seek(position)
+                data = f.read(read_size) + data
+        lines = data.decode("utf-8", errors="ignore").splitlines()
+        return [line for line in lines[-count:] if line.strip()]
+
+    def _rewrite(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self._entries:
+                f.write(json.dumps(entry._asdict(), ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def append(self, entry: Tuple[str, str]) -> HistoryEntry:
+        """添加一条记录 (表达式, 结果)"""
+        entry = HistoryEntry(entry[0], entry[1], time.time())
+        with self._lock:
+            self._entries.append(entry)
+            self._pending.append(entry)
+            should_flush = len(self._pending) >= self.batch_size
+            if not should_flush and self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if should_flush:
+            self.flush()
+        if self.on_append:
+            self.on_append(entry)
+        return entry
+
+    def flush(self):
+        """将待写记录追加到文件"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry._asdict(), ensure_ascii=False) + "\n" for entry in pending)
+
+    def page(self, offset: int = 0, limit: int = 50) -> List[HistoryEntry]:
+        """按从新到旧的顺序分页读取记录"""
+        with self._lock:
+            return list(islice(reversed(self._entries), offset, offset + limit))
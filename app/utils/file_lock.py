@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows 没有 fcntl，使用 msvcrt.locking
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    跨进程的建议性文件锁
+
+    锁定独立的 .lock 文件，同时运行的多个应用实例在读写同一个文件前获取该锁；
+    同一进程内的线程由 threading.Lock 串行，避免线程之间互相等待文件锁。
+    获取超时抛出 TimeoutError
+    """
+
+    def __init__(self, path: str, timeout: float = 10.0, poll_interval: float = 0.05):
+        """
+        :param path: 锁文件路径，例如 config.json.lock
+        :param timeout: 等待其他进程释放锁的最长时间（秒）
+        """
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._thread_lock = threading.Lock()
+        self._file = None
+
+    def _try_lock(self) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self):
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise TimeoutError(f"等待文件锁超时: {self.path}")
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "a+b")
+            deadline = time.monotonic() + self.timeout
+            while not self._try_lock():
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"等待文件锁超时: {self.path}")
+                time.sleep(self.poll_interval)
+        except BaseException:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._thread_lock.release()
+            raise
+
+    def release(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+            self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,185 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # 未安装 Pillow 时不生成缩略图，见 ThumbnailCache 的 source_fallback
+    Image = None
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+class DirectoryIndex:
+    """
+    目录文件索引
+
+    缓存目录中的文件列表，只有目录的 mtime 变化（增删文件）时才重新扫描，
+    避免每次构建页面都调用 os.listdir
+    """
+
+    def __init__(self, directory: str, extensions: Tuple[str, ...] = IMAGE_EXTENSIONS):
+        self.directory = directory
+        self.extensions = extensions
+        self._mtime = None
+        self._files: List[str] = []
+        self._lock = threading.Lock()
+
+    def files(self) -> List[str]:
+        """返回目录中符合扩展名的文件名列表（已排序）"""
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return []
+
+        with self._lock:
+            if mtime != self._mtime:
+                with os.scandir(self.directory) as entries:
+                    self._files = sorted(
+                        entry.name for entry in entries
+                        if entry.is_file() and entry.name.lower().endswith(self.extensions)
+                    )
+                self._mtime = mtime
+            return list(self._files)
+
+    def invalidate(self):
+        """强制下次访问时重新扫描"""
+        with self._lock:
+            self._mtime = None
+
+
+class ThumbnailCache:
+    """
+    缩略图缓存
+
+    缩略图在后台线程中生成并写入 assets 下的缓存目录，返回可直接用于 ft.Image 的 src。
+    缓存文件名包含源文件的 mtime 和尺寸，源文件变化后会自动生成新的缩略图。
+    同一张图片可以生成多种尺寸（例如轮播图使用的宽度），size 参数默认使用构造时的尺寸。
+    设置 max_bytes 后缓存目录按最近使用时间淘汰，超出时删除最久未使用的文件。
+    未安装 Pillow 时无法生成缩略图，source_fallback 为 True 时返回原图的 src，否则返回 None。
+    """
+
+    def __init__(self, assets_dir: str, cache_dir: str = "images/thumbnails", size: Tuple[int, int] = (96, 60), max_workers: int = 2, max_bytes: int = None, source_fallback: bool = True):
+        """
+        :param source_fallback: 未安装 Pillow 时是否使用原图，原图远大于显示尺寸时（例如小图标）应设为 False 并显示占位内容
+        """
+        self.assets_dir = assets_dir
+        self.source_fallback = source_fallback
+        self.cache_dir = cache_dir
+        self.size = size
+        self.max_bytes = max_bytes
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnail")
+        self._pending: Dict[Tuple[str, Tuple[int, int]], Future] = {}
+        self._lock = threading.Lock()
+
+    def _source_path(self, src: str) -> str:
+        return os.path.join(self.assets_dir, src)
+
+    def _thumbnail_src(self, src: str, size: Tuple[int, int]) -> Optional[str]:
+        """根据源文件路径、mtime 和尺寸计算缩略图的 src"""
+        try:
+            mtime = os.stat(self._source_path(src)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        key = hashlib.sha1(f"{src}:{mtime}:{size}".encode("utf-8")).hexdigest()
+        return f"{self.cache_dir}/{key}.png"
+
+    def get(self, src: str, size: Tuple[int, int] = None) -> Optional[str]:
+        """
+        获取已生成的缩略图 src，尚未生成时返回 None
+
+        :param src: 相对 assets 目录的图片路径，例如 images/backgrounds/background1.jpg
+        """
+        if Image is None:
+            return src if self.source_fallback else None
+        thumb_src = self._thumbnail_src(src, size or self.size)
+        if thumb_src is None:
+            return None
+        thumb_path = self._source_path(thumb_src)
+        try:
+            if self.max_bytes is not None:
+                # 更新修改时间作为最近使用时间，淘汰时保留常用的文件
+                os.utime(thumb_path)
+            elif not os.path.exists(thumb_path):
+                return None
+        except FileNotFoundError:
+            return None
+        return thumb_src
+
+    def request(self, src: str, callback: Callable[[str, str], None] = None, size: Tuple[int, int] = None) -> Optional[str]:
+        """
+        获取缩略图，未生成时提交到后台线程生成
+
+        已有缓存时直接返回 src；否则返回 None，生成完成后在后台线程中调用 callback(src, thumb_src)
+        """
+        size = size or self.size
+        thumb_src = self.get(src, size)
+        if thumb_src or Image is None:
+            # 未安装 Pillow 时不提交生成任务
+            return thumb_src
+
+        with self._lock:
+            future = self._pending.get((src, size))
+            if future is None:
+                future = self._executor.submit(self._generate, src, size)
+                self._pending[(src, size)] = future
+
+        if callback:
+            def done(f: Future):
+                result = f.result() if not f.cancelled() and f.exception() is None else None
+                if result:
+                    callback(src, result)
+            future.add_done_callback(done)
+        return None
+
+    def prefetch(self, srcs: Iterable[str], size: Tuple[int, int] = None):
+        """提前在后台生成缩略图，例如轮播图下一页的图片"""
+        for src in srcs:
+            self.request(src, size=size)
+
+    def _generate(self, src: str, size: Tuple[int, int]) -> Optional[str]:
+        try:
+            thumb_src = self._thumbnail_src(src, size)
+            if thumb_src is None:
+                return None
+            thumb_path = self._source_path(thumb_src)
+            if not os.path.exists(thumb_path):
+                os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+                with Image.open(self._source_path(src)) as img:
+                    img.thumbnail(size)
+                    # 先写临时文件再替换，避免读取到写了一半的缩略图
+                    tmp_path = f"{thumb_path}.{threading.get_ident()}.tmp"
+                    img.convert("RGB").save(tmp_path, format="PNG")
+                    os.replace(tmp_path, thumb_path)
+                self._evict(keep=thumb_path)
+            return thumb_src
+        except Exception as e:
+            print(f"生成缩略图失败 {src}: {str(e)}")
+            return None
+        finally:
+            with self._lock:
+                self._pending.pop((src, size), None)
+
+    def _evict(self, keep: str = None):
+        """缓存目录超过 max_bytes 时按最近使用时间删除旧文件"""
+        if self.max_bytes is None:
+            return
+        files = []
+        with os.scandir(self._source_path(self.cache_dir)) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(".png"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,85 @@
+import bisect
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import flet as ft
+
+# 默认的宽度断点（像素），窗口宽度跨过断点时才通知订阅者
+DEFAULT_BREAKPOINTS = (600, 900, 1200, 1600)
+
+Breakpoint = Callable[[float, float], Hashable]
+LayoutCallback = Callable[[float, float], None]
+
+
+def width_breakpoint(breakpoints: Tuple[int, ...] = DEFAULT_BREAKPOINTS) -> Breakpoint:
+    """按宽度断点分档，返回档位序号"""
+    return lambda width, height: bisect.bisect_right(breakpoints, width)
+
+
+class LayoutService:
+    """
+    窗口尺寸服务
+
+    监听 page.on_resized，拖动窗口时事件会连续触发，因此等待 debounce 秒没有新事件后才处理；
+    每个订阅者提供一个断点函数把尺寸映射为档位，只有档位变化时才通知该订阅者
+    """
+
+    def __init__(self, page: ft.Page, debounce: float = 0.2):
+        self.page = page
+        self.debounce = debounce
+        self.width, self.height = self._window_size()
+        # 订阅者 id -> (断点函数, 回调, 上一次的档位)
+        self._subscribers: Dict[int, List] = {}
+        self._next_id = 0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        page.on_resized = self._handle_resized
+
+    def _window_size(self) -> Tuple[float, float]:
+        window = self.page.window
+        return window.width or self.page.width or 0, window.height or self.page.height or 0
+
+    def subscribe(self, callback: LayoutCallback, breakpoint: Breakpoint = None) -> Callable[[], None]:
+        """
+        订阅尺寸变化
+
+        :param callback: 档位变化时调用 callback(宽度, 高度)
+        :param breakpoint: 断点函数，默认使用 DEFAULT_BREAKPOINTS 按宽度分档
+        :return: 取消订阅的函数
+        """
+        breakpoint = breakpoint or width_breakpoint()
+        with self._lock:
+            subscriber_id = self._next_id
+            self._next_id += 1
+            self._subscribers[subscriber_id] = [breakpoint, callback, breakpoint(self.width, self.height)]
+        return lambda: self._subscribers.pop(subscriber_id, None)
+
+    def _handle_resized(self, e: ft.WindowResizeEvent):
+        self.resize(e.width, e.height)
+
+    def resize(self, width: float, height: float):
+        """记录新的尺寸，debounce 秒内没有新的尺寸时通知订阅者"""
+        with self._lock:
+            self.width, self.height = width, height
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._notify)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _notify(self):
+        with self._lock:
+            self._timer = None
+            width, height = self.width, self.height
+            changed = []
+            for subscriber in self._subscribers.values():
+                breakpoint, callback, previous = subscriber
+                current = breakpoint(width, height)
+                if current != previous:
+                    subscriber[2] = current
+                    changed.append(callback)
+        for callback in changed:
+            try:
+                callback(width, height)
+            except Exception as e:
+                print(f"处理窗口尺寸变化失败: {str(e)}")
@@ -0,0 +1,159 @@
+import bisect
+import re
+from typing import Dict, List, Optional, Set
+
+# 中日韩字符范围（假名、中日韩统一表意文字、韩文音节、兼容表意文字）
+_CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+# 连续的中日韩字符片段，或由字母数字组成的单词
+_TOKEN_RE = re.compile(rf"[{_CJK_CHARS}]+|[^\W_{_CJK_CHARS}]+")
+_CJK_RE = re.compile(rf"[{_CJK_CHARS}]")
+
+
+def _is_cjk(char: str) -> bool:
+    return _CJK_RE.match(char) is not None
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    将文本切分为索引词
+
+    英文和数字按单词切分并转为小写；中文没有空格分词，
+    因此对连续的中文片段同时建立单字和相邻双字（bigram）索引
+    """
+    tokens = set()
+    for run in _TOKEN_RE.findall(text.lower()):
+        if _is_cjk(run[0]):
+            tokens.update(run)
+            tokens.update(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.add(run)
+    return tokens
+
+
+def query_terms(text: str) -> List[str]:
+    """
+    将查询切分为检索词
+
+    中文片段只使用双字（单个字时使用单字），英文单词作为前缀匹配
+    """
+    terms = []
+    for run in _TOKEN_RE.findall(text.lower()):
+        if _is_cjk(run[0]) and len(run) > 1:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            terms.append(run)
+    return terms
+
+
+class InvertedIndex:
+    """
+    倒排索引
+
+    维护 词 -> 文档 id 集合 的映射，增删改文档时增量更新；
+    查询时按集合大小从小到大求交集，不需要扫描所有文档
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._doc_terms: Dict[int, Set[str]] = {}
+        # 排序后的词表，用于英文前缀匹配，词表变化后延迟重新排序
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, doc_id: int, text: str) -> None:
+        """添加或更新文档"""
+        self.remove(doc_id)
+        terms = tokenize(text)
+        self._doc_terms[doc_id] = terms
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = set()
+                self._vocabulary_dirty = True
+            postings.add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        """删除文档"""
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings[term]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary_dirty = True
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        result = set()
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        for term in self._vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            result |= self._postings[term]
+        return result
+
+    def search(self, text: str) -> Optional[Set[int]]:
+        """
+        查询同时包含所有检索词的文档 id
+
+        查询中没有有效检索词时返回 None，表示不做文本过滤
+        """
+        terms = query_terms(text)
+        if not terms:
+            return None
+        matches = []
+        for term in terms:
+            if _is_cjk(term[0]):
+                postings = self._postings.get(term, set())
+            else:
+                postings = self._prefix_matches(term)
+            if not postings:
+                return set()
+            matches.append(postings)
+        matches.sort(key=len)
+        result = set(matches[0])
+        for postings in matches[1:]:
+            result &= postings
+            if not result:
+                break
+        return result
+
+
+class SortedIndex:
+    """
+    有序索引
+
+    按 (键, 文档 id) 排序保存，支持按键范围查询
+    """
+
+    def __init__(self):
+        self._entries: List[tuple] = []
+        self._keys: Dict[int, object] = {}
+
+    def add(self, doc_id: int, key) -> None:
+        """添加或更新文档的键，key 为 None 时只删除"""
+        self.remove(doc_id)
+        if key is None:
+            return
+        bisect.insort(self._entries, (key, doc_id))
+        self._keys[doc_id] = key
+
+    def remove(self, doc_id: int) -> None:
+        key = self._keys.pop(doc_id, None)
+        if key is None:
+            return
+        index = bisect.bisect_left(self._entries, (key, doc_id))
+        del self._entries[index]
+
+    def key_of(self, doc_id: int):
+        return self._keys.get(doc_id)
+
+    def range(self, start=None, end=None) -> List[int]:
+        """返回键在 [start, end] 范围内的文档 id，按键排序"""
+        lo = 0 if start is None else bisect.bisect_left(self._entries, (start,))
+        hi = len(self._entries) if end is None else bisect.bisect_right(self._entries, (end, float("inf")))
+        return [doc_id for _, doc_id in self._entries[lo:hi]]
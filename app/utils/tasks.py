@@ -0,0 +1,131 @@
+import atexit
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# 所有页面共用的后台线程池，限制同时运行的后台任务数量
+MAX_WORKERS = 4
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """返回共享线程池，第一次使用时创建"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="background")
+            atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+        return _executor
+
+
+class TaskCancelled(Exception):
+    """任务已被取消，由 CancelToken.raise_if_cancelled 抛出"""
+
+
+class CancelToken:
+    """
+    取消标记
+
+    线程无法被强制终止，任务需要在合适的位置检查 cancelled 或调用 raise_if_cancelled
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._on_report: Optional[Callable[[Any], None]] = None
+
+    def report(self, progress: Any):
+        """报告任务进度，例如 0~1 之间的小数"""
+        if self._on_report is not None and not self._event.is_set():
+            self._on_report(progress)
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelled()
+
+    def wait(self, timeout: float) -> bool:
+        """等待指定时间，期间被取消时提前返回 True，可替代 time.sleep"""
+        return self._event.wait(timeout)
+
+
+class BackgroundTask:
+    """
+    后台任务
+
+    job 在共享线程池中执行并接收 CancelToken；完成后调用 on_done(结果)，
+    出错时调用 on_error(异常)。任务被取消后不会再调用这些回调。
+    job 通过 token.report 报告的进度按 progress_interval 节流后传给 on_progress，
+    最终进度（>= 1）总是会被传递。on_finally 无论任务完成、出错还是被取消都会调用
+    """
+
+    def __init__(
+        self,
+        job: Callable[[CancelToken], Any],
+        on_done: Callable[[Any], None] = None,
+        on_error: Callable[[Exception], None] = None,
+        on_progress: Callable[[Any], None] = None,
+        on_finally: Callable[[], None] = None,
+        progress_interval: float = 0.1,
+    ):
+        self.token = CancelToken()
+        self._job = job
+        self._on_done = on_done
+        self._on_error = on_error
+        self._on_progress = on_progress
+        self._progress_interval = progress_interval
+        self._last_report = 0.0
+        if on_progress is not None:
+            self.token._on_report = self._report
+        self.future: Future = get_executor().submit(self._run)
+        if on_finally is not None:
+            self.future.add_done_callback(lambda _: on_finally())
+
+    def _report(self, progress: Any):
+        now = time.monotonic()
+        is_final = isinstance(progress, (int, float)) and progress >= 1
+        if is_final or now - self._last_report >= self._progress_interval:
+            self._last_report = now
+            self._on_progress(progress)
+
+    def _run(self):
+        try:
+            result = self._job(self.token)
+        except TaskCancelled:
+            return None
+        except Exception as e:
+            if self.token.cancelled:
+                return None
+            if self._on_error:
+                self._on_error(e)
+            else:
+                print(f"后台任务出错: {str(e)}")
+            return None
+        if not self.token.cancelled and self._on_done:
+            self._on_done(result)
+        return result
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def cancel(self):
+        """取消任务：尚未开始的任务直接移出队列，正在运行的任务通过 token 通知"""
+        self.token.cancel()
+        self.future.cancel()
+
+
+def run_in_background(job: Callable[[CancelToken], Any], **kwargs) -> BackgroundTask:
+    """在共享线程池中运行 job，返回可取消的任务，参数见 BackgroundTask"""
+    return BackgroundTask(job, **kwargs)
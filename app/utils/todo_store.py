@@ -0,0 +1,413 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.utils.search_index import InvertedIndex, SortedIndex
+
+# 任务文本中的标签（#标签）和截止日期（@2024-01-31）
+_TAG_RE = re.compile(r"(?:^|\s)#(\S+)")
+_DUE_RE = re.compile(r"(?:^|\s)@(\d{4}-\d{2}-\d{2})(?=\s|$)")
+
+
+@dataclass
+class TodoItem:
+    """待办事项数据"""
+    id: int
+    name: str
+    completed: bool = False
+    created_at: float = 0.0
+    tags: List[str] = field(default_factory=list)
+    due_date: Optional[str] = None  # ISO 格式日期，例如 2024-01-31
+
+
+def parse_task_text(text: str) -> Tuple[str, List[str], Optional[str]]:
+    """
+    从输入文本中解析任务名称、标签和截止日期
+
+    例如 "写周报 #工作 @2024-01-31" 解析为 ("写周报", ["工作"], "2024-01-31")
+    """
+    tags = list(dict.fromkeys(_TAG_RE.findall(text)))
+    due = _DUE_RE.findall(text)
+    name = _DUE_RE.sub(" ", _TAG_RE.sub(" ", text))
+    return " ".join(name.split()), tags, due[-1] if due else None
+
+
+def format_task_text(item: TodoItem) -> str:
+    """将任务格式化为可编辑的输入文本，是 parse_task_text 的逆操作"""
+    parts = [item.name]
+    parts.extend(f"#{tag}" for tag in item.tags)
+    if item.due_date:
+        parts.append(f"@{item.due_date}")
+    return " ".join(parts)
+
+
+class TodoStore:
+    """
+    基于 SQLite 的待办事项存储
+
+    每次增删改只写入单行记录，不会重写整个文件；
+    读取使用按 id 的游标分页，数据量很大时也只加载需要显示的部分
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Flet 的事件处理可能运行在不同线程中，由 _lock 保证串行访问
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS todos (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    tags TEXT NOT NULL DEFAULT '',
+                    due_date TEXT
+                )
+                """
+            )
+            # 旧版本数据库没有标签和截止日期字段
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(todos)")}
+            if "tags" not in columns:
+                self._conn.execute("ALTER TABLE todos ADD COLUMN tags TEXT NOT NULL DEFAULT ''")
+            if "due_date" not in columns:
+                self._conn.execute("ALTER TABLE todos ADD COLUMN due_date TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_todos_completed ON todos (completed, id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_todos_due_date ON todos (due_date)")
+
+    _COLUMNS = "id, name, completed, created_at, tags, due_date"
+
+    @staticmethod
+    def _row_to_item(row) -> TodoItem:
+        return TodoItem(
+            id=row[0],
+            name=row[1],
+            completed=bool(row[2]),
+            created_at=row[3],
+            tags=row[4].split() if row[4] else [],
+            due_date=row[5],
+        )
+
+    def add(self, name: str, tags: List[str] = None, due_date: Optional[str] = None) -> TodoItem:
+        """新增任务"""
+        created_at = time.time()
+        tags = tags or []
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO todos (name, completed, created_at, tags, due_date) VALUES (?, 0, ?, ?, ?)",
+                (name, created_at, " ".join(tags), due_date),
+            )
+        return TodoItem(id=cursor.lastrowid, name=name, completed=False, created_at=created_at, tags=tags, due_date=due_date)
+
+    def update(self, item_id: int, name: str, tags: List[str], due_date: Optional[str]) -> None:
+        """修改任务名称、标签和截止日期"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE todos SET name = ?, tags = ?, due_date = ? WHERE id = ?",
+                (name, " ".join(tags), due_date, item_id),
+            )
+
+    def set_completed(self, item_id: int, completed: bool) -> None:
+        """修改任务完成状态"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE todos SET completed = ? WHERE id = ?", (int(completed), item_id))
+
+    def delete(self, item_id: int) -> None:
+        """删除任务"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM todos WHERE id = ?", (item_id,))
+
+    def delete_completed(self) -> List[int]:
+        """删除所有已完成任务，返回被删除任务的 id"""
+        with self._lock, self._conn:
+            ids = [row[0] for row in self._conn.execute("SELECT id FROM todos WHERE completed = 1")]
+            self._conn.execute("DELETE FROM todos WHERE completed = 1")
+        return ids
+
+    def count(self, completed: Optional[bool] = None) -> int:
+        """统计任务数量，completed 为 None 时统计全部"""
+        with self._lock:
+            if completed is None:
+                row = self._conn.execute("SELECT COUNT(*) FROM todos").fetchone()
+            else:
+                row = self._conn.execute("SELECT COUNT(*) FROM todos WHERE completed = ?", (int(completed),)).fetchone()
+        return row[0]
+
+    def page(self, after_id: int = 0, limit: int = 100, completed: Optional[bool] = None) -> List[TodoItem]:
+        """
+        按 id 顺序分页读取任务
+
+        :param after_id: 上一页最后一条任务的 id，第一页传 0
+        :param limit: 每页数量
+        :param completed: 只读取指定完成状态的任务，None 表示全部
+        """
+        sql = f"SELECT {self._COLUMNS} FROM todos WHERE id > ?"
+        params = [after_id]
+        if completed is not None:
+            sql += " AND completed = ?"
+            params.append(int(completed))
+        sql += " ORDER BY id LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_item(row) for row in rows]
+
+    def get_many(self, item_ids: Iterable[int]) -> List[TodoItem]:
+        """按 id 读取任务，结果按 id 排序"""
+        item_ids = list(item_ids)
+        items = []
+        # SQLite 对单条语句的参数数量有限制，分批查询
+        for i in range(0, len(item_ids), 500):
+            batch = item_ids[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT {self._COLUMNS} FROM todos WHERE id IN ({placeholders})", batch
+                ).fetchall()
+            items.extend(self._row_to_item(row) for row in rows)
+        items.sort(key=lambda item: item.id)
+        return items
+
+    def iter_all(self) -> List[TodoItem]:
+        """读取所有任务，用于建立搜索索引"""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {self._COLUMNS} FROM todos ORDER BY id").fetchall()
+        return [self._row_to_item(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TodoSearchIndex:
+    """
+    待办事项搜索索引
+
+    包含任务名称和标签的倒排索引、标签索引以及按截止日期排序的索引，
+    全部在内存中增量维护
+    """
+
+    def __init__(self, items: Iterable[TodoItem] = ()):
+        self.text = InvertedIndex()
+        self.tags: Dict[str, Set[int]] = {}
+        self.due = SortedIndex()
+        self._item_tags: Dict[int, List[str]] = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item: TodoItem) -> None:
+        """添加或更新任务"""
+        self.remove(item.id)
+        self.text.add(item.id, " ".join([item.name, *item.tags]))
+        self._item_tags[item.id] = [tag.lower() for tag in item.tags]
+        for tag in self._item_tags[item.id]:
+            self.tags.setdefault(tag, set()).add(item.id)
+        self.due.add(item.id, item.due_date)
+
+    def remove(self, item_id: int) -> None:
+        self.text.remove(item_id)
+        self.due.remove(item_id)
+        for tag in self._item_tags.pop(item_id, ()):
+            self.tags[tag].discard(item_id)
+            if not self.tags[tag]:
+                del self.tags[tag]
+
+    def search(self, query: str) -> List[int]:
+        """
+        搜索任务，返回按截止日期排序的任务 id（没有截止日期的排在最后）
+
+        查询语法：普通文字为全文检索，#标签 按标签过滤，@2024-01-31 表示截止日期不晚于该日期
+        """
+        text, tags, due_before = parse_task_text(query)
+        candidates = []
+        text_matches = self.text.search(text)
+        if text_matches is not None:
+            candidates.append(text_matches)
+        for tag in tags:
+            candidates.append(self.tags.get(tag.lower(), set()))
+        if due_before:
+            candidates.append(set(self.due.range(end=due_before)))
+        if not candidates:
+            return []
+
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for ids in candidates[1:]:
+            result &= ids
+
+        def sort_key(item_id):
+            due = self.due.key_of(item_id)
+            return due is None, due or "", item_id
+
+        return sorted(result, key=sort_key)
+
+
+class TodoModel:
+    """
+    待办事项模型
+
+    在 TodoStore 之上维护任务计数和按完成状态划分的索引集合，
+    计数只在增删改时增量更新，不需要遍历任务或查询数据库；
+    搜索索引在第一次搜索时建立，之后随增删改增量更新
+    """
+
+    def __init__(self, store: TodoStore):
+        self.store = store
+        self.total = store.count()
+        self.active_count = store.count(completed=False)
+        # 已加载任务及其按状态划分的索引
+        self.items: Dict[int, TodoItem] = {}
+        self.active_ids: Set[int] = set()
+        self.completed_ids: Set[int] = set()
+        # 搜索结果中读取的、尚未按页加载的任务
+        self._detached: Dict[int, TodoItem] = {}
+        self._search_index: Optional[TodoSearchIndex] = None
+        # 按完成状态分页的游标（None 表示全部），游标之前该状态的任务都已加载
+        self._cursors: Dict[Optional[bool], int] = {None: 0, False: 0, True: 0}
+        self.has_more = True
+        # 指定完成状态的任务是否还有未加载的
+        self._status_has_more: Dict[bool, bool] = {False: True, True: True}
+
+    @property
+    def completed_count(self) -> int:
+        return self.total - self.active_count
+
+    def _index(self, item: TodoItem) -> None:
+        self.items[item.id] = item
+        (self.completed_ids if item.completed else self.active_ids).add(item.id)
+
+    def _unindex(self, item_id: int) -> Optional[TodoItem]:
+        item = self.items.pop(item_id, None)
+        self.active_ids.discard(item_id)
+        self.completed_ids.discard(item_id)
+        return item
+
+    def ids_with_status(self, completed: bool) -> Set[int]:
+        """返回已加载任务中指定完成状态的 id 集合"""
+        return self.completed_ids if completed else self.active_ids
+
+    def has_more_with_status(self, completed: Optional[bool] = None) -> bool:
+        """指定完成状态的任务是否还有未加载的，None 表示全部"""
+        if completed is None:
+            return self.has_more
+        return self.has_more and self._status_has_more[completed]
+
+    def load_more(self, limit: int = 100, completed: Optional[bool] = None) -> List[TodoItem]:
+        """
+        从存储中加载下一页任务
+
+        :param completed: 只加载指定完成状态的任务，None 表示全部
+        """
+        if not self.has_more_with_status(completed):
+            return []
+        # 全部任务的游标之前的任务都已加载，从两个游标中较大的一个继续
+        after_id = max(self._cursors[None], self._cursors[completed])
+        items = self.store.page(after_id=after_id, limit=limit, completed=completed)
+        if items:
+            self._cursors[completed] = items[-1].id
+        if len(items) < limit:
+            if completed is None:
+                self.has_more = False
+            else:
+                self._status_has_more[completed] = False
+                # 两种状态都加载完就是全部加载完
+                self.has_more = any(self._status_has_more.values())
+        # 翻页前新增的任务已经加载过，跳过以免重复显示
+        items = [item for item in items if item.id not in self.items]
+        # 已在搜索结果中读取过的任务复用同一个对象，保证状态一致
+        items = [self._detached.pop(item.id, item) for item in items]
+        for item in items:
+            self._index(item)
+        return items
+
+    def add(self, text: str) -> TodoItem:
+        """
+        根据输入文本新增任务，文本中可以包含 #标签 和 @截止日期
+
+        新任务立即加入已加载的任务，翻页时会跳过它以免重复
+        """
+        name, tags, due_date = parse_task_text(text)
+        item = self.store.add(name or text.strip(), tags, due_date)
+        self.total += 1
+        self.active_count += 1
+        if self._search_index is not None:
+            self._search_index.add(item)
+        self._index(item)
+        return item
+
+    def update(self, item: TodoItem, text: str) -> None:
+        """根据输入文本修改任务名称、标签和截止日期"""
+        name, tags, due_date = parse_task_text(text)
+        item.name, item.tags, item.due_date = name or item.name, tags, due_date
+        self.store.update(item.id, item.name, item.tags, item.due_date)
+        if self._search_index is not None:
+            self._search_index.add(item)
+
+    def set_completed(self, item: TodoItem, completed: bool) -> bool:
+        """
+        修改完成状态，返回状态是否发生变化
+
+        搜索结果中未加载的任务改为新状态后，如果位于新状态已加载的范围内，
+        就加入已加载的任务，否则按新状态翻页时会漏掉它
+        """
+        if item.completed == completed:
+            return False
+        self.store.set_completed(item.id, completed)
+        loaded = item.id in self.items
+        if loaded:
+            self._unindex(item.id)
+        item.completed = completed
+        if loaded or item.id <= self._cursors[completed] or not self._status_has_more[completed]:
+            self._detached.pop(item.id, None)
+            self._index(item)
+        self.active_count += -1 if completed else 1
+        return True
+
+    def delete(self, item: TodoItem) -> None:
+        self.store.delete(item.id)
+        self._unindex(item.id)
+        self._detached.pop(item.id, None)
+        if self._search_index is not None:
+            self._search_index.remove(item.id)
+        self.total -= 1
+        if not item.completed:
+            self.active_count -= 1
+
+    def clear_completed(self) -> Set[int]:
+        """删除所有已完成任务（包括未加载的），返回被删除任务的 id"""
+        removed = self.store.delete_completed()
+        self.total -= len(removed)
+        self._status_has_more[True] = False
+        self.has_more = self._status_has_more[False]
+        for item_id in removed:
+            self._unindex(item_id)
+            self._detached.pop(item_id, None)
+            if self._search_index is not None:
+                self._search_index.remove(item_id)
+        return set(removed)
+
+    def search(self, query: str, limit: int = 200) -> Tuple[List[TodoItem], int]:
+        """
+        搜索任务，返回 (前 limit 条结果, 结果总数)
+
+        第一次搜索时从存储读取全部任务建立索引
+        """
+        if self._search_index is None:
+            self._search_index = TodoSearchIndex(self.store.iter_all())
+        ids = self._search_index.search(query)
+        visible_ids = ids[:limit]
+        # 只保留本次结果中未加载的任务
+        detached = {item_id: self._detached[item_id] for item_id in visible_ids if item_id in self._detached}
+        missing = [item_id for item_id in visible_ids if item_id not in self.items and item_id not in detached]
+        for item in self.store.get_many(missing):
+            detached[item.id] = item
+        self._detached = detached
+        items = [self.items.get(item_id) or detached[item_id] for item_id in visible_ids]
+        return items, len(ids)
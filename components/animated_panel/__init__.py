@@ -0,0 +1,3 @@
+from .animated_panel import AnimatedPanel
+
+__all__ = ["AnimatedPanel"]
@@ -0,0 +1,83 @@
+from typing import Callable, Optional
+
+import flet as ft
+
+
+class AnimatedPanel(ft.Container):
+    """
+    带滑入/滑出动画的面板
+
+    内容在第一次打开时才通过 build_body 创建；关闭时先播放滑出动画，
+    在 on_animation_end 事件中再把高度折叠为 0，事件处理线程不需要等待动画结束。
+    动画期间重新打开时不会被折叠
+    """
+
+    def __init__(
+        self,
+        build_body: Callable[[], ft.Control],
+        duration: int = 500,
+        curve: ft.AnimationCurve = ft.AnimationCurve.DECELERATE,
+        hidden_offset: ft.transform.Offset = ft.transform.Offset(0, -1.5),
+        on_open: Optional[Callable[[], None]] = None,
+        on_close: Optional[Callable[[], None]] = None,
+        **kwargs,
+    ):
+        """
+        :param build_body: 创建面板内容的函数，只调用一次
+        :param duration: 动画时长（毫秒）
+        :param hidden_offset: 关闭时的偏移，(0, -1.5) 向上滑出，(0, 1.5) 向下滑出
+        """
+        super().__init__(
+            height=0,
+            offset=hidden_offset,
+            animate_offset=ft.animation.Animation(duration, curve),
+            on_animation_end=self._handle_animation_end,
+            **kwargs,
+        )
+        self.build_body = build_body
+        self.hidden_offset = hidden_offset
+        self.on_open = on_open
+        self.on_close = on_close
+        self.is_open = False
+
+    def open(self):
+        if self.is_open:
+            return
+        if self.content is None:
+            self.content = self.build_body()
+        self.is_open = True
+        self.height = None
+        self.offset = ft.transform.Offset(0, 0)
+        self._update()
+        if self.on_open:
+            self.on_open()
+
+    def close(self):
+        if not self.is_open:
+            return
+        self.is_open = False
+        self.offset = self.hidden_offset
+        if self.page is None:
+            # 未挂载时没有动画，直接折叠
+            self.height = 0
+        self._update()
+        if self.on_close:
+            self.on_close()
+
+    def toggle(self):
+        if self.is_open:
+            self.close()
+        else:
+            self.open()
+
+    def _handle_animation_end(self, e):
+        # 滑出动画结束后折叠高度，动画期间重新打开时保持展开
+        if not self.is_open and self.height != 0:
+            self.height = 0
+            self._update()
+
+    def _update(self):
+        try:
+            self.update()
+        except AssertionError:
+            pass
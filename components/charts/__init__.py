@@ -0,0 +1,13 @@
+from .aggregate import aggregate, bar_groups, fold_tail, pie_sections
+from .downsample import downsample, lttb, min_max, to_xy
+from .live import LiveChartUpdater, LiveSeries, RingBuffer
+from .pie import InteractivePieChart
+from .series import LineSeries
+
+__all__ = [
+    "aggregate", "bar_groups", "fold_tail", "pie_sections",
+    "downsample", "lttb", "min_max", "to_xy",
+    "LiveChartUpdater", "LiveSeries", "RingBuffer",
+    "InteractivePieChart",
+    "LineSeries",
+]
@@ -0,0 +1,112 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import flet as ft
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖，缺失时使用字典累加
+    np = None
+
+OTHER_LABEL = "其他"
+
+DEFAULT_COLORS = [
+    ft.Colors.BLUE,
+    ft.Colors.AMBER,
+    ft.Colors.PINK,
+    ft.Colors.GREEN,
+    ft.Colors.PURPLE,
+    ft.Colors.ORANGE,
+    ft.Colors.CYAN,
+    ft.Colors.GREY,
+]
+
+
+def _columns(records, category: str, value: str):
+    """从记录中取出分类列和数值列"""
+    if np is not None and isinstance(records, np.ndarray):
+        # NumPy 结构化数组直接按字段取列，不需要逐行遍历
+        return records[category], records[value].astype(float, copy=False)
+    categories, values = [], []
+    for record in records:
+        categories.append(record[category])
+        values.append(record[value])
+    return categories, values
+
+
+def aggregate(records, category: str = "category", value: str = "value", max_groups: int = None, other_label: str = OTHER_LABEL) -> List[Tuple[str, float]]:
+    """
+    按分类汇总数值
+
+    :param records: 字典列表或 NumPy 结构化数组
+    :param max_groups: 最多保留的分组数量，超出部分合并为 other_label
+    :return: 按数值从大到小排列的 (分类, 合计)
+    """
+    categories, values = _columns(records, category, value)
+    if np is not None:
+        if len(categories) == 0:
+            return []
+        # np.unique + bincount 一次完成分组求和
+        labels, inverse = np.unique(np.asarray(categories), return_inverse=True)
+        sums = np.bincount(inverse.ravel(), weights=np.asarray(values, dtype=float))
+        order = np.argsort(-sums, kind="stable")
+        groups = [(str(labels[i]), float(sums[i])) for i in order]
+    else:
+        totals = defaultdict(float)
+        for key, amount in zip(categories, values):
+            totals[key] += amount
+        groups = sorted(((str(key), total) for key, total in totals.items()), key=lambda group: -group[1])
+    return fold_tail(groups, max_groups, other_label)
+
+
+def fold_tail(groups: List[Tuple[str, float]], max_groups: int = None, other_label: str = OTHER_LABEL) -> List[Tuple[str, float]]:
+    """将排在 max_groups - 1 之后的分组合并为一组"""
+    if max_groups is None or len(groups) <= max_groups:
+        return groups
+    head = groups[:max_groups - 1]
+    return head + [(other_label, sum(total for _, total in groups[max_groups - 1:]))]
+
+
+def _color(colors: Union[Sequence[str], Dict[str, str]], label: str, index: int) -> str:
+    """colors 为字典时按分类取颜色，否则按顺序循环使用"""
+    if isinstance(colors, dict):
+        return colors.get(label, DEFAULT_COLORS[index % len(DEFAULT_COLORS)])
+    return colors[index % len(colors)]
+
+
+def pie_sections(groups: Iterable[Tuple[str, float]], colors: Union[Sequence[str], Dict[str, str]] = DEFAULT_COLORS, show_percent: bool = True, **section_kwargs) -> List[ft.PieChartSection]:
+    """由汇总结果创建饼图扇区，标题为百分比"""
+    groups = list(groups)
+    total = sum(amount for _, amount in groups) or 1
+    return [
+        ft.PieChartSection(
+            amount,
+            title=f"{amount / total:.0%}" if show_percent else label,
+            color=_color(colors, label, index),
+            **section_kwargs,
+        )
+        for index, (label, amount) in enumerate(groups)
+    ]
+
+
+def bar_groups(groups: Iterable[Tuple[str, float]], colors: Union[Sequence[str], Dict[str, str]] = DEFAULT_COLORS, width: float = 40, **rod_kwargs) -> Tuple[List[ft.BarChartGroup], List[ft.ChartAxisLabel]]:
+    """由汇总结果创建条形图分组和对应的 x 轴标签"""
+    bars, labels = [], []
+    for index, (label, amount) in enumerate(groups):
+        bars.append(
+            ft.BarChartGroup(
+                x=index,
+                bar_rods=[
+                    ft.BarChartRod(
+                        from_y=0,
+                        to_y=amount,
+                        width=width,
+                        color=_color(colors, label, index),
+                        tooltip=label,
+                        **rod_kwargs,
+                    )
+                ],
+            )
+        )
+        labels.append(ft.ChartAxisLabel(value=index, label=ft.Container(ft.Text(label), padding=10)))
+    return bars, labels
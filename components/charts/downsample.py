@@ -0,0 +1,118 @@
+import math
+from typing import Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖，缺失时使用纯 Python 实现
+    np = None
+
+
+def to_xy(data) -> Tuple[Sequence[float], Sequence[float]]:
+    """
+    将数据统一转换为 (x 序列, y 序列)
+
+    支持形如 (N, 2) 的 NumPy 数组、(x 数组, y 数组) 元组、一维 y 数组（x 使用下标）
+    以及任意 (x, y) 可迭代对象
+    """
+    if np is not None and isinstance(data, np.ndarray):
+        if data.ndim == 1:
+            return np.arange(len(data), dtype=float), data.astype(float, copy=False)
+        return data[:, 0].astype(float, copy=False), data[:, 1].astype(float, copy=False)
+    if np is not None and isinstance(data, tuple) and len(data) == 2 and all(isinstance(d, np.ndarray) for d in data):
+        return data[0].astype(float, copy=False), data[1].astype(float, copy=False)
+    xs, ys = [], []
+    for x, y in data:
+        xs.append(float(x))
+        ys.append(float(y))
+    if np is not None:
+        return np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+    return xs, ys
+
+
+def _bucket_edges(start: int, stop: int, buckets: int) -> List[int]:
+    """将 [start, stop) 平均分为 buckets 个区间，返回 buckets + 1 个边界"""
+    size = (stop - start) / buckets
+    return [start + int(math.floor(i * size)) for i in range(buckets)] + [stop]
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    LTTB（Largest-Triangle-Three-Buckets）降采样
+
+    保留首尾两点，中间按 x 顺序分为 threshold - 2 个桶，每个桶选出与前一个选中点、
+    下一个桶平均点组成三角形面积最大的点，能较好地保留曲线的形状和峰值。
+    返回选中点的下标
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    edges = _bucket_edges(1, n - 1, threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        # 下一个桶的平均点，最后一个桶使用终点
+        if i + 2 < len(edges):
+            next_start, next_stop = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_stop = n - 1, n
+        ax, ay = xs[a], ys[a]
+        if np is not None and isinstance(xs, np.ndarray):
+            cx = xs[next_start:next_stop].mean()
+            cy = ys[next_start:next_stop].mean()
+            # 三角形面积的两倍，省略常数因子不影响比较
+            areas = np.abs((ax - cx) * (ys[start:stop] - ay) - (ax - xs[start:stop]) * (cy - ay))
+            a = start + int(areas.argmax())
+        else:
+            count = next_stop - next_start
+            cx = sum(xs[next_start:next_stop]) / count
+            cy = sum(ys[next_start:next_stop]) / count
+            best_area = -1.0
+            for j in range(start, stop):
+                area = abs((ax - cx) * (ys[j] - ay) - (ax - xs[j]) * (cy - ay))
+                if area > best_area:
+                    best_area, a = area, j
+        selected.append(a)
+    selected.append(n - 1)
+    return selected
+
+
+def min_max(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    最小/最大值降采样
+
+    按 x 顺序分为 threshold // 2 个桶，每个桶保留最小值和最大值两点（按原顺序），
+    不会丢失任何尖峰，适合噪声较大的监控数据。返回选中点的下标
+    """
+    n = len(xs)
+    buckets = threshold // 2
+    if threshold >= n or buckets < 1:
+        return list(range(n))
+    selected = []
+    edges = _bucket_edges(0, n, buckets)
+    for start, stop in zip(edges, edges[1:]):
+        if np is not None and isinstance(ys, np.ndarray):
+            segment = ys[start:stop]
+            low, high = start + int(segment.argmin()), start + int(segment.argmax())
+        else:
+            segment = range(start, stop)
+            low = min(segment, key=ys.__getitem__)
+            high = max(segment, key=ys.__getitem__)
+        selected.extend(sorted({low, high}))
+    return selected
+
+
+METHODS = {"lttb": lttb, "minmax": min_max}
+
+
+def downsample(xs: Sequence[float], ys: Sequence[float], threshold: int, method: str = "lttb") -> Iterable[Tuple[float, float]]:
+    """按指定方法降采样，返回 (x, y) 点"""
+    try:
+        select = METHODS[method]
+    except KeyError:
+        raise ValueError(f"未知的降采样方法: {method}")
+    indices = select(xs, ys, threshold)
+    if np is not None and isinstance(xs, np.ndarray):
+        indices = np.asarray(indices, dtype=int)
+        return zip(xs[indices].tolist(), ys[indices].tolist())
+    return ((xs[i], ys[i]) for i in indices)
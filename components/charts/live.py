@@ -0,0 +1,169 @@
+import threading
+from collections import deque
+from typing import List, Sequence, Tuple
+
+import flet as ft
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖，缺失时使用 deque
+    np = None
+
+
+class RingBuffer:
+    """
+    固定容量的 (x, y) 环形缓冲区
+
+    写满后覆盖最旧的数据，内存占用与数据流运行多久无关。
+    total 记录累计写入的样本数，用于计算两次读取之间新增了多少样本
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.total = 0
+        self._lock = threading.Lock()
+        if np is not None:
+            self._xs = np.zeros(capacity, dtype=float)
+            self._ys = np.zeros(capacity, dtype=float)
+        else:
+            self._samples: deque = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def append(self, x: float, y: float):
+        with self._lock:
+            if np is not None:
+                index = self.total % self.capacity
+                self._xs[index] = x
+                self._ys[index] = y
+            else:
+                self._samples.append((x, y))
+            self.total += 1
+
+    def extend(self, xs: Sequence[float], ys: Sequence[float]):
+        """批量写入，超过容量时只保留最后 capacity 个样本"""
+        count = len(xs)
+        if count == 0:
+            return
+        with self._lock:
+            if np is not None:
+                xs = np.asarray(xs, dtype=float)[-self.capacity:]
+                ys = np.asarray(ys, dtype=float)[-self.capacity:]
+                start = (self.total + count - len(xs)) % self.capacity
+                # 分两段写入，处理回绕
+                first = min(len(xs), self.capacity - start)
+                self._xs[start:start + first] = xs[:first]
+                self._ys[start:start + first] = ys[:first]
+                self._xs[:len(xs) - first] = xs[first:]
+                self._ys[:len(ys) - first] = ys[first:]
+            else:
+                self._samples.extend(zip(xs, ys))
+            self.total += count
+
+    def tail(self, count: int) -> Tuple[int, List[Tuple[float, float]]]:
+        """
+        读取最新的 count 个样本（不超过缓冲区中的数量），按写入顺序返回
+
+        :return: (读取时的累计样本数, 样本列表)
+        """
+        with self._lock:
+            count = min(count, len(self))
+            if count == 0:
+                return self.total, []
+            if np is not None:
+                indices = np.arange(self.total - count, self.total) % self.capacity
+                return self.total, list(zip(self._xs[indices].tolist(), self._ys[indices].tolist()))
+            # deque 按下标访问两端很快，只读取最新的 count 个样本，不复制整个缓冲区
+            return self.total, [self._samples[i] for i in range(-count, 0)]
+
+
+class LiveSeries:
+    """
+    实时折线
+
+    生产者通过 append/extend 写入环形缓冲区，flush 时只把新增的样本追加到折线末尾，
+    并从开头删除同样数量的旧点，Flet 只需要发送变化的点而不是整条折线
+    """
+
+    def __init__(self, capacity: int = 200, **line_kwargs):
+        self.buffer = RingBuffer(capacity)
+        self.line = ft.LineChartData(data_points=[], **line_kwargs)
+        self._flushed_total = 0
+
+    def append(self, x: float, y: float):
+        self.buffer.append(x, y)
+
+    def extend(self, xs: Sequence[float], ys: Sequence[float]):
+        self.buffer.extend(xs, ys)
+
+    def flush(self) -> bool:
+        """将新增样本同步到折线，返回是否有变化"""
+        new_count = self.buffer.total - self._flushed_total
+        if new_count <= 0:
+            return False
+        total, samples = self.buffer.tail(new_count)
+        points = self.line.data_points
+        points.extend(ft.LineChartDataPoint(x, y) for x, y in samples)
+        overflow = len(points) - self.buffer.capacity
+        if overflow > 0:
+            del points[:overflow]
+        self._flushed_total = total
+        return True
+
+    def x_range(self) -> Tuple[float, float]:
+        points = self.line.data_points
+        if not points:
+            return 0.0, 1.0
+        return points[0].x, points[-1].x
+
+
+class LiveChartUpdater:
+    """
+    实时图表刷新器
+
+    在后台线程中按固定频率（默认 10 Hz）刷新图表，与生产者写入数据的频率无关；
+    只有折线有新数据时才调用一次 chart.update()，并让 x 轴跟随最新的数据滚动
+    """
+
+    def __init__(self, chart: ft.LineChart, series: List[LiveSeries], interval: float = 0.1, follow_x: bool = True):
+        self.chart = chart
+        self.series = series
+        self.interval = interval
+        self.follow_x = follow_x
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop_event.is_set()
+
+    def start(self):
+        if self.running:
+            return
+        # 每次运行使用新的事件，stop 后立即 start 时旧线程仍按自己的事件退出
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop_event,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def flush(self) -> bool:
+        changed = [series.flush() for series in self.series]
+        if not any(changed):
+            return False
+        if self.follow_x:
+            ranges = [series.x_range() for series in self.series if series.line.data_points]
+            self.chart.min_x = min(start for start, _ in ranges)
+            self.chart.max_x = max(end for _, end in ranges)
+        try:
+            self.chart.update()
+        except AssertionError:
+            # 图表尚未挂载或已从页面移除
+            pass
+        return True
+
+    def _run(self, stop_event: threading.Event):
+        while not stop_event.wait(self.interval):
+            self.flush()
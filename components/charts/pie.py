@@ -0,0 +1,53 @@
+from typing import Any, Dict, List
+
+import flet as ft
+
+
+class InteractivePieChart(ft.PieChart):
+    """
+    鼠标悬停时高亮扇区的饼图
+
+    记录上一次悬停的扇区，悬停位置不变时直接忽略事件；
+    位置变化时只恢复旧扇区、高亮新扇区，而不是重设所有扇区的样式
+    """
+
+    def __init__(self, sections: List[ft.PieChartSection], normal_style: Dict[str, Any], hover_style: Dict[str, Any], **kwargs):
+        """
+        :param normal_style: 普通状态的扇区属性，例如 {"radius": 50}
+        :param hover_style: 悬停状态的扇区属性，与 normal_style 使用相同的键
+        """
+        super().__init__(sections=sections, on_chart_event=self._on_chart_event, **kwargs)
+        self.normal_style = normal_style
+        self.hover_style = hover_style
+        self.hovered_index = -1
+        for section in sections:
+            self._apply(section, normal_style)
+
+    def set_sections(self, sections: List[ft.PieChartSection]):
+        """替换扇区，新扇区使用普通样式"""
+        for section in sections:
+            self._apply(section, self.normal_style)
+        self.sections = sections
+        self.hovered_index = -1
+
+    @staticmethod
+    def _apply(section: ft.PieChartSection, style: Dict[str, Any]):
+        for name, value in style.items():
+            setattr(section, name, value)
+
+    def _section(self, index: int):
+        return self.sections[index] if 0 <= index < len(self.sections) else None
+
+    def _on_chart_event(self, e: ft.PieChartEvent):
+        index = e.section_index if e.section_index is not None else -1
+        if index == self.hovered_index:
+            return
+        previous = self._section(self.hovered_index)
+        current = self._section(index)
+        self.hovered_index = index
+        if previous is not None:
+            self._apply(previous, self.normal_style)
+        if current is not None:
+            self._apply(current, self.hover_style)
+        if previous is not None or current is not None:
+            self.update()
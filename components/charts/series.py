@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from typing import List
+
+import flet as ft
+
+from .downsample import downsample, to_xy
+
+
+class LineSeries:
+    """
+    折线图数据适配器
+
+    接收 NumPy 数组或 (x, y) 可迭代对象，按图表的像素宽度降采样后再创建
+    LineChartDataPoint，避免把几十万个点全部发送到客户端。
+    每个宽度的降采样结果会被缓存，窗口在几个尺寸之间切换时不需要重新计算
+    """
+
+    # 最多缓存的宽度数量
+    CACHE_SIZE = 8
+
+    def __init__(self, data, method: str = "lttb", points_per_pixel: float = 1.0, **line_kwargs):
+        """
+        :param data: 数据，支持格式见 to_xy
+        :param method: 降采样方法，"lttb" 或 "minmax"
+        :param points_per_pixel: 每个像素保留的点数
+        :param line_kwargs: 传给 ft.LineChartData 的样式参数
+        """
+        self.method = method
+        self.points_per_pixel = points_per_pixel
+        self.line = ft.LineChartData(**line_kwargs)
+        self._cache: OrderedDict = OrderedDict()
+        self.set_data(data)
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def set_data(self, data):
+        """替换数据并清空缓存"""
+        self.xs, self.ys = to_xy(data)
+        self._cache.clear()
+        self._width = None
+
+    def points(self, width: int) -> List[ft.LineChartDataPoint]:
+        """返回适合指定像素宽度的数据点"""
+        threshold = max(3, int(width * self.points_per_pixel))
+        points = self._cache.get(threshold)
+        if points is None:
+            points = [ft.LineChartDataPoint(x, y) for x, y in downsample(self.xs, self.ys, threshold, self.method)]
+            self._cache[threshold] = points
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(threshold)
+        return points
+
+    def render(self, width: int) -> ft.LineChartData:
+        """更新并返回折线数据，宽度不变时直接返回"""
+        if width != self._width:
+            self.line.data_points = self.points(width)
+            self._width = width
+        return self.line
+
+    @property
+    def max_y(self) -> float:
+        return float(max(self.ys)) if len(self.ys) else 0.0
+
+    @property
+    def min_y(self) -> float:
+        return float(min(self.ys)) if len(self.ys) else 0.0
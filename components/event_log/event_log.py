@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import deque
+from typing import List, Optional
+
+import flet as ft
+
+
+class EventLog(ft.Container):
+    """
+    有界事件日志
+
+    最多保留 capacity 条记录，超出后丢弃最旧的记录；使用 ListView 只渲染可见的行。
+    同一帧内（默认 1/60 秒）写入的多条记录合并为一次更新，可以在任意线程中调用 log
+    """
+
+    def __init__(self, capacity: int = 200, height: float = 200, flush_interval: float = 1 / 60, show_time: bool = True, text_size: float = 13, **kwargs):
+        """
+        :param capacity: 最多保留的记录数
+        :param flush_interval: 合并写入的时间窗口（秒）
+        :param show_time: 是否在记录前显示时间
+        """
+        super().__init__(height=height, **kwargs)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.show_time = show_time
+        self.text_size = text_size
+        # 环形缓冲区保存记录文本，ListView 的行与其一一对应
+        self.entries: deque = deque(maxlen=capacity)
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self.list_view = ft.ListView(spacing=2, auto_scroll=True, expand=True)
+        self.content = self.list_view
+
+    def log(self, message: str):
+        """添加一条记录，实际的界面更新会合并到下一帧"""
+        if self.show_time:
+            message = f"[{time.strftime('%H:%M:%S')}] {message}"
+        with self._lock:
+            self._pending.append(message)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        """将待写记录添加到列表，并移除超出容量的旧行"""
+        with self._lock:
+            self._flush_timer = None
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        # 一次写入超过容量时只保留最后 capacity 条
+        pending = pending[-self.capacity:]
+        self.entries.extend(pending)
+        rows = self.list_view.controls
+        rows.extend(ft.Text(message, size=self.text_size, selectable=True) for message in pending)
+        overflow = len(rows) - self.capacity
+        if overflow > 0:
+            del rows[:overflow]
+        try:
+            self.list_view.update()
+        except AssertionError:
+            # 日志尚未挂载到页面上，下次页面更新时显示
+            pass
+
+    def clear(self):
+        with self._lock:
+            self._pending = []
+        self.entries.clear()
+        self.list_view.controls.clear()
+        try:
+            self.list_view.update()
+        except AssertionError:
+            pass
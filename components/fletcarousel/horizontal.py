@@ -1,5 +1,5 @@
 import time
-from typing import Union, Optional
+from typing import Callable, Union, Optional
 from flet import (
     Border,
     Control,
@@ -55,6 +55,7 @@ class BasicHorizontalCarousel(FletCarousel):
             auto_cycle: AutoCycle = None,
             buttons: Optional[list[TextButton |
                                    IconButton | FloatingActionButton]] = None,
+            on_change: Optional[Callable[[tuple], None]] = None,
     ):
         FletCarousel.__init__(
             self,
@@ -81,6 +82,8 @@ class BasicHorizontalCarousel(FletCarousel):
         self.spacing = spacing
         self.auto_cycle = auto_cycle
         self.buttons = buttons
+        # 显示范围变化后调用 on_change(current_items)，可用于预加载后面的项目
+        self.on_change = on_change
 
         if len(items) > 0:
             self.current_items = (0, self.items_count)
@@ -127,6 +130,7 @@ class BasicHorizontalCarousel(FletCarousel):
                 1, self.current_items[1] + 1
             self.__item_list.controls = self.items[self.current_items[0]:self.current_items[1]]
         self.page.update(self.__item_list)
+        self.__notify_change()
 
     def prev(self, e=None):
         if self.__item_list.controls and self.current_items[0] > 0:
@@ -134,6 +138,28 @@ class BasicHorizontalCarousel(FletCarousel):
                 1, self.current_items[1] - 1
             self.__item_list.controls = self.items[self.current_items[0]:self.current_items[1]]
         self.page.update(self.__item_list)
+        self.__notify_change()
+
+    def set_items_count(self, items_count: int):
+        """修改同时显示的项目数量，保持当前的起始位置"""
+        items_count = max(1, items_count)
+        if items_count == self.items_count:
+            return
+        self.items_count = items_count
+        if not self.items:
+            return
+        start = max(0, min(self.current_items[0], len(self.items) - items_count))
+        self.current_items = start, start + items_count
+        self.__item_list.controls = self.items[self.current_items[0]:self.current_items[1]]
+        try:
+            self.page.update(self.__item_list)
+        except AssertionError:
+            pass
+        self.__notify_change()
+
+    def __notify_change(self):
+        if self.on_change:
+            self.on_change(self.current_items)
 
     def pause(self):
         self._auto_cycle_status = 0
@@ -0,0 +1,3 @@
+from .stat_card import StatCard, StatsPoller
+
+__all__ = ["StatCard", "StatsPoller"]
@@ -0,0 +1,206 @@
+import asyncio
+import inspect
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import flet as ft
+
+# 数据源：普通函数或 async 函数，返回卡片显示的数值
+DataSource = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+class StatCard(ft.Container):
+    """
+    统计卡片
+
+    显示标题、数值和说明，数值与上一次相同时不会更新；数值变化时只更新数值对应的 Text
+    """
+
+    def __init__(self, title: str, label: str, value: Any = None, text_color: str = None, formatter: Callable[[Any], str] = str, placeholder: str = "-", **kwargs):
+        """
+        :param value: 初始数值，为 None 时显示 placeholder
+        :param formatter: 将数值转换为显示文本
+        """
+        kwargs.setdefault("padding", 20)
+        kwargs.setdefault("border_radius", ft.border_radius.all(10))
+        kwargs.setdefault("width", 200)
+        kwargs.setdefault("height", 150)
+        self.formatter = formatter
+        self.placeholder = placeholder
+        self.value = value
+        self.value_text = ft.Text(self._format(value), color=text_color, size=40, weight="bold")
+        super().__init__(
+            content=ft.Column([
+                ft.Text(title, color=text_color, size=20),
+                self.value_text,
+                ft.Text(label, color=text_color, size=14),
+            ]),
+            **kwargs,
+        )
+
+    def _format(self, value: Any) -> str:
+        return self.placeholder if value is None else self.formatter(value)
+
+    def set_value(self, value: Any, update: bool = True) -> bool:
+        """
+        设置数值，返回数值是否发生变化
+
+        :param update: 是否立即更新 Text，批量刷新时传入 False 后统一更新
+        """
+        if value == self.value:
+            return False
+        self.value = value
+        self.value_text.value = self._format(value)
+        if update:
+            try:
+                self.value_text.update()
+            except AssertionError:
+                # 卡片尚未挂载到页面上，显示时会使用最新的数值
+                pass
+        return True
+
+
+class _Binding:
+    """一张卡片与数据源的绑定，记录上一次的数值和连续失败次数"""
+
+    def __init__(self, card: StatCard, source: DataSource):
+        self.card = card
+        self.source = source
+        self.failures = 0
+        self.skip = 0
+
+
+class StatsPoller:
+    """
+    统计卡片轮询器
+
+    所有卡片共用一个后台线程，每隔 interval 秒调用一次数据源，async 数据源在同一个事件循环中并发执行。
+    只有数值变化的卡片会被更新，同一轮中所有变化的 Text 合并为一次 page.update。
+    页面隐藏（pause）后轮询间隔逐轮翻倍，最长 max_interval 秒；恢复（resume）时立即轮询一次。
+    数据源出错时该数据源跳过的轮数按失败次数翻倍，不影响其他卡片
+    """
+
+    def __init__(self, interval: float = 5.0, max_interval: float = 60.0, max_skip: int = 32):
+        self.interval = interval
+        self.max_interval = max_interval
+        self.max_skip = max_skip
+        self._bindings: Dict[str, _Binding] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._hidden = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def bind(self, key: str, card: StatCard, source: DataSource):
+        """
+        绑定卡片和数据源
+
+        key 已存在时（例如主题重建后创建了新的卡片）替换卡片，新卡片直接显示上一次的数值
+        """
+        with self._lock:
+            binding = self._bindings.get(key)
+            if binding is None:
+                self._bindings[key] = _Binding(card, source)
+                return
+            card.set_value(binding.card.value, update=False)
+            binding.card = card
+            binding.source = source
+
+    def unbind(self, key: str):
+        with self._lock:
+            self._bindings.pop(key, None)
+
+    def start(self):
+        """启动后台线程，已启动时等同于 resume"""
+        if self._thread is not None:
+            self.resume()
+            return
+        self._stopped = False
+        self._hidden = False
+        self._thread = threading.Thread(target=self._run, name="stats-poller", daemon=True)
+        self._thread.start()
+
+    def pause(self):
+        """页面隐藏时调用，之后的轮询间隔逐轮翻倍"""
+        self._hidden = True
+
+    def resume(self):
+        """页面显示时调用，恢复正常间隔并立即轮询"""
+        self._hidden = False
+        self._wake.set()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+        self._thread = None
+
+    def _run(self):
+        interval = self.interval
+        while not self._stopped:
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"刷新统计数据失败: {str(e)}")
+            interval = min(interval * 2, self.max_interval) if self._hidden else self.interval
+            self._wake.wait(interval)
+            self._wake.clear()
+
+    def _due_bindings(self) -> List[_Binding]:
+        with self._lock:
+            bindings = list(self._bindings.values())
+        due = []
+        for binding in bindings:
+            if binding.skip > 0:
+                binding.skip -= 1
+            else:
+                due.append(binding)
+        return due
+
+    @staticmethod
+    async def _gather(sources: List[DataSource]) -> List[Any]:
+        return await asyncio.gather(*(source() for source in sources), return_exceptions=True)
+
+    def poll(self):
+        """调用一轮到期的数据源，并刷新数值发生变化的卡片"""
+        due = self._due_bindings()
+        if not due:
+            return
+        results: Dict[_Binding, Any] = {}
+        async_bindings = []
+        for binding in due:
+            if inspect.iscoroutinefunction(binding.source):
+                async_bindings.append(binding)
+                continue
+            try:
+                results[binding] = binding.source()
+            except Exception as e:
+                results[binding] = e
+        if async_bindings:
+            values = asyncio.run(self._gather([binding.source for binding in async_bindings]))
+            results.update(zip(async_bindings, values))
+
+        changed = []
+        for binding, result in results.items():
+            if isinstance(result, Exception):
+                binding.failures += 1
+                binding.skip = min(2 ** binding.failures, self.max_skip)
+                print(f"统计数据源出错: {str(result)}")
+                continue
+            binding.failures = 0
+            if binding.card.set_value(result, update=False):
+                changed.append(binding.card.value_text)
+        self._flush(changed)
+
+    @staticmethod
+    def _flush(texts: List[ft.Text]):
+        """将变化的 Text 按所在页面合并为一次更新，未挂载的 Text 在显示时自然使用新值"""
+        pages: Dict[int, List] = {}
+        for text in texts:
+            page = text.page
+            if page is not None:
+                pages.setdefault(id(page), [page]).append(text)
+        for page, *controls in pages.values():
+            try:
+                page.update(*controls)
+            except AssertionError:
+                pass